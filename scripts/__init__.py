@@ -0,0 +1,7 @@
+"""
+GitHub helper scripts.
+
+The modules run as scripts from this directory (``python scripts/create_issue.py``)
+and import as a package from the repository root
+(``from scripts.create_issue import create_issue``).
+"""
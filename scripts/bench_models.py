@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Compare memory and request counts of PyGithub objects and models records.
+
+Offline (no token needed): builds N synthetic issue payloads and measures
+the memory retained by PyGithub Issue objects versus IssueRecords.
+
+Live: lists issues / searches code in a real repository both ways, touching
+the fields the helpers use, and reports the requests each path spent
+(measured from the rate-limit counters, so avoid running other jobs on the
+same token meanwhile) together with retained memory.
+
+Usage:
+    python bench_models.py offline [count]
+    python bench_models.py live owner/repo [code-query]
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from github import Github
+from github.Issue import Issue
+
+if __package__:
+    from .github_client import get_github_client, get_repo
+    from .models import IssueRecord, list_issues_fast, search_code_fast
+else:
+    from github_client import get_github_client, get_repo
+    from models import IssueRecord, list_issues_fast, search_code_fast
+
+
+def measure(build):
+    """Run build() and return (result, retained bytes, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, elapsed
+
+
+def remaining_requests():
+    """Return (core, search) requests remaining; /rate_limit itself is free."""
+    limits = get_github_client().get_rate_limit()
+    limits = getattr(limits, "resources", limits)
+    search = getattr(limits, "code_search", None) or limits.search
+    return limits.core.remaining, search.remaining
+
+
+def report(label, retained, elapsed, requests=None):
+    line = f"  {label:<28} {retained / 1024 / 1024:8.1f} MiB  {elapsed:7.2f}s"
+    if requests is not None:
+        line += f"  {requests[0]:5d} core + {requests[1]} search requests"
+    print(line)
+
+
+def touch_issue(issue):
+    """Read the fields the helpers use."""
+    return (
+        issue.number, issue.title, issue.state, issue.html_url, issue.updated_at,
+        [label.name for label in issue.labels],
+        [user.login for user in issue.assignees],
+        issue.user.login if issue.user else None,
+    )
+
+
+def offline(count: int):
+    payload = json.dumps([
+        {
+            "number": n,
+            "title": f"Issue {n}: something is broken in module {n % 97}",
+            "state": "open",
+            "body": "Steps to reproduce...\n" * 10,
+            "labels": [{"id": 1, "name": "bug", "color": "d73a4a", "url": "u"}],
+            "assignees": [{"login": "dev", "id": 2, "url": "u", "type": "User"}],
+            "user": {"login": "reporter", "id": 3, "url": "u", "type": "User"},
+            "comments": n % 7,
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-02-01T00:00:00Z",
+            "html_url": f"https://github.com/o/r/issues/{n}",
+            "url": f"https://api.github.com/repos/o/r/issues/{n}",
+        }
+        for n in range(count)
+    ])
+
+    g = Github()
+    print(f"Retained memory for {count} issues parsed from JSON:")
+    _, retained, elapsed = measure(
+        lambda: [g.create_from_raw_data(Issue, d) for d in json.loads(payload)]
+    )
+    report("PyGithub Issue objects", retained, elapsed)
+    _, retained, elapsed = measure(
+        lambda: [IssueRecord.from_json(d) for d in json.loads(payload)]
+    )
+    report("models.IssueRecord", retained, elapsed)
+
+
+def live(repo_name: str, code_query: str = None):
+    repository = get_repo(repo_name)
+
+    print(f"Issues in {repo_name} (state=all):")
+    before = remaining_requests()
+    issues, retained, elapsed = measure(
+        lambda: [touch_issue(i) and i for i in repository.get_issues(state="all")]
+    )
+    after = remaining_requests()
+    report("PyGithub path", retained, elapsed, (before[0] - after[0], before[1] - after[1]))
+    del issues
+
+    before = remaining_requests()
+    _, retained, elapsed = measure(lambda: list_issues_fast(repo_name, state="all"))
+    after = remaining_requests()
+    report("fast path", retained, elapsed, (before[0] - after[0], before[1] - after[1]))
+
+    if code_query:
+        print(f"Code search '{code_query}' in {repo_name}:")
+        before = remaining_requests()
+        g = get_github_client(bucket="code_search")
+        _, retained, elapsed = measure(lambda: [
+            f"{r.repository.full_name}/{r.path}"
+            for r in g.search_code(f"{code_query} repo:{repo_name}")
+        ])
+        after = remaining_requests()
+        report("PyGithub path", retained, elapsed, (before[0] - after[0], before[1] - after[1]))
+
+        before = remaining_requests()
+        _, retained, elapsed = measure(lambda: search_code_fast(code_query, repo=repo_name))
+        after = remaining_requests()
+        report("fast path", retained, elapsed, (before[0] - after[0], before[1] - after[1]))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("offline", "live"):
+        print("Usage:")
+        print("  python bench_models.py offline [count]")
+        print("  python bench_models.py live owner/repo [code-query]")
+        sys.exit(1)
+
+    if sys.argv[1] == "offline":
+        offline(int(sys.argv[2]) if len(sys.argv) > 2 else 50000)
+    else:
+        live(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
@@ -14,21 +14,36 @@ Usage:
     )
 """
 
-from github import Github
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from github import GithubException
+from github.Issue import Issue
 
-def load_template(template_name: str = "default") -> str:
-    """Load issue template from assets folder."""
-    templates_dir = Path(__file__).parent.parent / "assets"
-    template_path = templates_dir / "issue_template.md"
+if __package__:
+    from .dedupe import find_duplicates, get_index
+    from .github_client import RatePacer, cached, get_github_client, get_repo, invalidate
+    from .models import IssueRecord
+    from .resilience import CircuitOpenError, call, resilient
+    from .templates import get_template, render_template
+else:
+    from dedupe import find_duplicates, get_index
+    from github_client import RatePacer, cached, get_github_client, get_repo, invalidate
+    from models import IssueRecord
+    from resilience import CircuitOpenError, call, resilient
+    from templates import get_template, render_template
 
-    if template_path.exists():
-        return template_path.read_text()
-    return ""
 
+def load_template(template_name: str = "default", **variables) -> str:
+    """Render a cached issue template from the assets folder (see templates.py)."""
+    return render_template("issue", template_name, **variables)
 
+
+@resilient("issues.create")
 def create_issue(
     repo: str,
     title: str,
@@ -37,6 +52,9 @@ def create_issue(
     labels: list = None,
     assignees: list = None,
     milestone: int = None,
+    template_vars: dict = None,
+    check_duplicates: bool = False,
+    on_duplicate: str = "skip",
 ):
     """
     Create a GitHub issue with optional template and automation.
@@ -49,22 +67,40 @@ def create_issue(
         labels: List of label names to apply
         assignees: List of user logins to assign
         milestone: Milestone number to add to
+        template_vars: Values for {{ placeholders }} in the template
+        check_duplicates: Look for a likely duplicate among open issues in the
+                          local index first
+        on_duplicate: When one is found: "skip" (return the existing issue),
+                      "comment" (post this report on it and return it) or
+                      "create" (only warn)
 
     Returns:
         Issue object from PyGithub
     """
-    # Initialize GitHub client
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    if not token:
-        raise ValueError("GITHUB_PERSONAL_ACCESS_TOKEN environment variable not set")
+    if check_duplicates and on_duplicate not in ("skip", "comment", "create"):
+        raise ValueError(f"on_duplicate must be skip, comment or create, not {on_duplicate!r}")
 
-    g = Github(token)
-    repository = g.get_repo(repo)
+    repository = get_repo(repo, write=True)
 
     # Prepare issue body
     issue_body = body
     if issue_body is None and body_template:
-        issue_body = load_template(body_template)
+        issue_body = load_template(body_template, **(template_vars or {}))
+
+    if check_duplicates:
+        duplicates = find_duplicates(repo, title, issue_body, limit=1)
+        if duplicates:
+            match = duplicates[0]
+            print(f"⚠ Likely duplicate of #{match['number']} "
+                  f"({match['similarity']:.0%} similar): {match['title']}")
+            if on_duplicate != "create":
+                existing = repository.get_issue(match["number"])
+                if on_duplicate == "comment":
+                    existing.create_comment(
+                        f"Possible duplicate report: **{title}**\n\n{issue_body or ''}".rstrip()
+                    )
+                    print(f"✓ Added comment to issue #{existing.number}")
+                return existing
 
     # Get milestone object if provided
     milestone_obj = None
@@ -79,6 +115,10 @@ def create_issue(
         assignees=assignees or [],
         milestone=milestone_obj,
     )
+    invalidate("issues", repo)
+    if check_duplicates:
+        # Later creates in the same run see this issue without a refresh
+        get_index(repo, max_age=None).add(IssueRecord.from_json(issue._rawData))
 
     print(f"✓ Created issue #{issue.number}: {title}")
     print(f"  URL: {issue.html_url}")
@@ -91,6 +131,70 @@ def create_issue(
     return issue
 
 
+def bulk_create_issues(
+    repo: str,
+    issues: list,
+    body_template: str = None,
+    max_workers: int = 4,
+    writes_per_minute: float = 60,
+    check_duplicates: bool = False,
+    on_duplicate: str = "skip",
+):
+    """
+    Create many issues, rendering bodies from one compiled template.
+
+    Args:
+        repo: Repository in format "owner/repo"
+        issues: List of dicts with "title" and optionally "body",
+                "template_vars", "labels", "assignees", "milestone"
+        body_template: Template used for entries without a "body"
+        max_workers: Number of issues created concurrently
+        writes_per_minute: Pace of create requests across all workers
+        check_duplicates: Check each entry against the local duplicate index
+        on_duplicate: "skip", "comment" or "create" (see create_issue)
+
+    Returns:
+        List of Issue objects, in the order of issues (existing issues for
+        skipped duplicates, None for entries that failed)
+    """
+    template = get_template("issue", body_template) if body_template else None
+    pacer = RatePacer(per_minute=writes_per_minute)
+    if check_duplicates:
+        get_index(repo, wait=True)  # refresh once up front instead of in every worker
+
+    def create(entry):
+        # One bad entry must not lose the issues the others already created
+        try:
+            body = entry.get("body")
+            if body is None and template:
+                body = template.render(**entry.get("template_vars", {}))
+            pacer.wait()
+            return create_issue(
+                repo=repo,
+                title=entry["title"],
+                body=body,
+                labels=entry.get("labels"),
+                assignees=entry.get("assignees"),
+                milestone=entry.get("milestone"),
+                check_duplicates=check_duplicates,
+                on_duplicate=on_duplicate,
+            )
+        except GithubException as e:
+            print(f"✗ Could not create '{entry.get('title')}': {e.data.get('message', str(e))}")
+        except (CircuitOpenError, KeyError, ValueError) as e:
+            print(f"✗ Could not create '{entry.get('title')}': {e}")
+        return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        created = list(pool.map(create, issues))
+
+    done = sum(issue is not None for issue in created)
+    verb = "Processed" if check_duplicates else "Created"
+    print(f"✓ {verb} {done} of {len(issues)} issues in {repo}")
+    return created
+
+
+@resilient("issues.update", idempotent=True)
 def update_issue(
     repo: str,
     issue_number: int,
@@ -119,9 +223,7 @@ def update_issue(
     Returns:
         Updated Issue object
     """
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    g = Github(token)
-    repository = g.get_repo(repo)
+    repository = get_repo(repo, write=True)
     issue = repository.get_issue(issue_number)
 
     # Build update kwargs
@@ -143,11 +245,13 @@ def update_issue(
 
     if update_kwargs:
         issue.edit(**update_kwargs)
+        invalidate("issues", repo)
         print(f"✓ Updated issue #{issue_number}")
 
     return issue
 
 
+@resilient("issues.comment")
 def add_issue_comment(repo: str, issue_number: int, comment: str):
     """
     Add a comment to an issue.
@@ -160,9 +264,7 @@ def add_issue_comment(repo: str, issue_number: int, comment: str):
     Returns:
         IssueComment object
     """
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    g = Github(token)
-    repository = g.get_repo(repo)
+    repository = get_repo(repo, write=True)
     issue = repository.get_issue(issue_number)
 
     issue_comment = issue.create_comment(comment)
@@ -171,6 +273,7 @@ def add_issue_comment(repo: str, issue_number: int, comment: str):
     return issue_comment
 
 
+@resilient("issues.close")
 def close_issue(
     repo: str,
     issue_number: int,
@@ -189,9 +292,7 @@ def close_issue(
     Returns:
         Closed Issue object
     """
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    g = Github(token)
-    repository = g.get_repo(repo)
+    repository = get_repo(repo, write=True)
     issue = repository.get_issue(issue_number)
 
     # Add comment if provided
@@ -200,11 +301,13 @@ def close_issue(
 
     # Close issue
     issue.edit(state="closed", state_reason=state_reason)
+    invalidate("issues", repo)
     print(f"✓ Closed issue #{issue_number} ({state_reason})")
 
     return issue
 
 
+@resilient("search.issues", idempotent=True)
 def search_issues(
     query: str,
     repo: str = None,
@@ -223,8 +326,7 @@ def search_issues(
     Returns:
         List of Issue objects
     """
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    g = Github(token)
+    g = get_github_client(bucket="search")
 
     # Add repo filter if provided
     full_query = query
@@ -258,9 +360,7 @@ def list_issues(
     Returns:
         List of Issue objects
     """
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    g = Github(token)
-    repository = g.get_repo(repo)
+    repository = get_repo(repo)
 
     kwargs = {"state": state}
     if labels:
@@ -270,20 +370,188 @@ def list_issues(
     if since:
         kwargs["since"] = since
 
-    issues = repository.get_issues(**kwargs)
-
-    issue_list = list(issues)
+    key = ("issues", repo, state, tuple(labels or ()), assignee, since)
+    # Not hedged: a duplicate would repeat every page (models.list_issues_fast
+    # hedges page by page)
+    issue_list = cached(key, lambda: call(
+        lambda: list(repository.get_issues(**kwargs)),
+        "issues.list", idempotent=True,
+    ))
     print(f"Found {len(issue_list)} issues in {repo} ({state})")
 
     return issue_list
 
 
+def close_stale_issues(
+    repo: str,
+    days: int = 90,
+    labels: list = None,
+    comment: str = "Closing due to inactivity. Please reopen if still relevant.",
+    state_reason: str = "not_planned",
+    dry_run: bool = False,
+    max_workers: int = 4,
+    writes_per_minute: float = 60,
+    checkpoint: str = None,
+):
+    """
+    Close open issues that have not been updated for a number of days.
+
+    Candidates are selected server-side with an ``updated:<date`` search, so
+    only stale issues are transferred. Closing runs on a thread pool with all
+    writes paced to stay clear of GitHub's secondary rate limits. With a
+    checkpoint file, a killed run resumes with the saved candidate list and
+    skips issues it already handled (and comments it already posted); once
+    every candidate is handled the checkpoint is removed, so the next run
+    searches again. An issue that cannot be closed is reported and skipped
+    without stopping the run.
+
+    Args:
+        repo: Repository in format "owner/repo"
+        days: Close issues not updated in this many days
+        labels: Only consider issues with all of these labels
+        comment: Comment to post before closing (None to skip)
+        state_reason: "not_planned" or "completed"
+        dry_run: Only list the issues that would be closed
+        max_workers: Number of issues closed concurrently
+        writes_per_minute: Pace of comment/close requests across all workers
+        checkpoint: Optional JSON file used to resume an interrupted run
+
+    Returns:
+        List of issue numbers closed (or that would be closed in a dry run)
+    """
+    params = {"repo": repo, "days": days, "labels": sorted(labels or [])}
+    state = _load_checkpoint(checkpoint, params)
+    if state is not None and not _pending(state):
+        print(f"Checkpoint {checkpoint} is complete; searching again")
+        state = None
+
+    if state is None:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).date().isoformat()
+        query = f"is:issue is:open updated:<{cutoff} repo:{repo}"
+        for label in labels or []:
+            query += f' label:"{label}"'
+
+        results = get_github_client(bucket="search").search_issues(
+            query=query, sort="updated", order="asc"
+        )
+        candidates = [
+            {"number": i.number, "title": i.title, "url": i.url} for i in results
+        ]
+        print(f"Found {results.totalCount} stale issues matching: {query}")
+        if results.totalCount > len(candidates):
+            print(f"⚠ Search returns at most {len(candidates)}; run again for the rest")
+
+        state = {"params": params, "query": query, "candidates": candidates,
+                 "done": [], "failed": {}, "commented": []}
+        if not dry_run:
+            _save_checkpoint(checkpoint, state)
+    else:
+        handled = len(state["done"]) + len(state.get("failed", {}))
+        print(f"Resuming from {checkpoint}: {handled}/{len(state['candidates'])} done")
+
+    pending = _pending(state)
+
+    if dry_run:
+        for c in pending:
+            print(f"  - #{c['number']}: {c['title']}")
+        print(f"Dry run: would close {len(pending)} issues in {repo}")
+        return [c["number"] for c in pending]
+
+    g = get_github_client(write=True, owner=repo.split("/")[0])
+    pacer = RatePacer(per_minute=writes_per_minute)
+    lock = threading.Lock()
+    failed = state.setdefault("failed", {})
+    # Issues already commented on by a run that was killed before closing them
+    commented = state.setdefault("commented", [])
+
+    def close(candidate):
+        number = candidate["number"]
+        # Build the issue from the saved URL; no GET needed to comment or edit
+        issue = g.create_from_raw_data(Issue, candidate)
+        try:
+            if comment and number not in commented:
+                pacer.wait()
+                issue.create_comment(comment)
+                with lock:
+                    commented.append(number)
+                    _save_checkpoint(checkpoint, state)
+            pacer.wait()
+            call(lambda: issue.edit(state="closed", state_reason=state_reason),
+                 "issues.update", idempotent=True)
+            print(f"✓ Closed issue #{number} ({state_reason})")
+            closed = True
+        except GithubException as e:
+            if e.status not in (404, 410):
+                print(f"✗ Could not close #{number}: {e.data.get('message', str(e))}")
+                with lock:
+                    failed[str(number)] = e.data.get("message", str(e))
+                    _save_checkpoint(checkpoint, state)
+                return None
+            print(f"✓ Issue #{number} no longer exists")
+            closed = False
+
+        with lock:
+            state["done"].append(number)
+            _save_checkpoint(checkpoint, state)
+        return number if closed else None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        closed = [n for n in pool.map(close, pending) if n is not None]
+
+    invalidate("issues", repo)
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    print(f"✓ Closed {len(closed)} stale issues in {repo}")
+    if failed:
+        print(f"⚠ {len(failed)} issues could not be closed: "
+              f"{', '.join('#' + n for n in sorted(failed, key=int))}")
+    return closed
+
+
+def _pending(state: dict):
+    """Candidates of a checkpoint that have been neither closed nor given up on."""
+    handled = set(state["done"]) | {int(n) for n in state.get("failed", {})}
+    return [c for c in state["candidates"] if c["number"] not in handled]
+
+
+def _load_checkpoint(path: str, params: dict):
+    """Load a checkpoint written for the same parameters, if any."""
+    if not path or not os.path.exists(path):
+        return None
+    state = json.loads(Path(path).read_text())
+    if state.get("params") != params:
+        print(f"⚠ Ignoring checkpoint {path} written for different parameters")
+        return None
+    return state
+
+
+def _save_checkpoint(path: str, state: dict):
+    """Atomically write checkpoint state to path."""
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    Path(tmp_path).write_text(json.dumps(state))
+    os.replace(tmp_path, path)
+
+
 if __name__ == "__main__":
     # Example usage
     import sys
 
+    if len(sys.argv) > 2 and sys.argv[1] == "close-stale":
+        days = int(sys.argv[sys.argv.index("--days") + 1]) if "--days" in sys.argv else 90
+        checkpoint = sys.argv[sys.argv.index("--checkpoint") + 1] if "--checkpoint" in sys.argv else None
+        close_stale_issues(
+            repo=sys.argv[2],
+            days=days,
+            dry_run="--dry-run" in sys.argv,
+            checkpoint=checkpoint,
+        )
+        sys.exit(0)
+
     if len(sys.argv) < 3:
         print("Usage: python create_issue.py <repo> <title> [body]")
+        print("       python create_issue.py close-stale <repo> [--days N] [--dry-run] [--checkpoint FILE]")
         print("Example: python create_issue.py owner/repo 'Bug: Login fails' 'Description...'")
         sys.exit(1)
 
@@ -15,21 +15,24 @@ Usage:
     )
 """
 
-from github import Github
-import os
-from pathlib import Path
+from github import GithubException
 
+if __package__:
+    from .github_client import get_repo, invalidate
+    from .resilience import call, resilient
+    from .templates import render_template
+else:
+    from github_client import get_repo, invalidate
+    from resilience import call, resilient
+    from templates import render_template
 
-def load_template(template_name: str = "default") -> str:
-    """Load PR template from assets folder."""
-    templates_dir = Path(__file__).parent.parent / "assets"
-    template_path = templates_dir / "pr_template.md"
 
-    if template_path.exists():
-        return template_path.read_text()
-    return ""
+def load_template(template_name: str = "default", **variables) -> str:
+    """Render a cached PR template from the assets folder (see templates.py)."""
+    return render_template("pr", template_name, **variables)
 
 
+@resilient("pulls.create")
 def create_pull_request(
     repo: str,
     title: str,
@@ -43,6 +46,7 @@ def create_pull_request(
     labels: list = None,
     assignees: list = None,
     maintainer_can_modify: bool = True,
+    template_vars: dict = None,
 ):
     """
     Create a pull request with optional template and automation.
@@ -60,22 +64,17 @@ def create_pull_request(
         labels: List of label names to apply
         assignees: List of user logins to assign
         maintainer_can_modify: Allow maintainer edits
+        template_vars: Values for {{ placeholders }} in the template
 
     Returns:
         PullRequest object from PyGithub
     """
-    # Initialize GitHub client
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    if not token:
-        raise ValueError("GITHUB_PERSONAL_ACCESS_TOKEN environment variable not set")
-
-    g = Github(token)
-    repository = g.get_repo(repo)
+    repository = get_repo(repo, write=True)
 
     # Prepare PR body
     pr_body = body
     if pr_body is None and body_template:
-        pr_body = load_template(body_template)
+        pr_body = load_template(body_template, **(template_vars or {}))
 
     # Create pull request
     pr = repository.create_pull(
@@ -86,6 +85,8 @@ def create_pull_request(
         draft=draft,
         maintainer_can_modify=maintainer_can_modify,
     )
+    # Pull requests also show up in the issues listing
+    invalidate("issues", repo)
 
     print(f"✓ Created PR #{pr.number}: {title}")
     print(f"  URL: {pr.html_url}")
@@ -113,6 +114,7 @@ def create_pull_request(
     return pr
 
 
+@resilient("pulls.update", idempotent=True)
 def update_pr(
     repo: str,
     pr_number: int,
@@ -136,9 +138,7 @@ def update_pr(
         reviewers: List of reviewers to add
         labels: List of labels to add
     """
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    g = Github(token)
-    repository = g.get_repo(repo)
+    repository = get_repo(repo, write=True)
     pr = repository.get_pull(pr_number)
 
     # Update basic fields
@@ -166,9 +166,13 @@ def update_pr(
         pr.add_to_labels(*labels)
         print(f"✓ Added labels: {', '.join(labels)}")
 
+    if update_kwargs or labels:
+        invalidate("issues", repo)
+
     return pr
 
 
+@resilient("pulls.merge")
 def merge_pr(
     repo: str,
     pr_number: int,
@@ -191,9 +195,7 @@ def merge_pr(
     Returns:
         PullRequestMergeStatus object
     """
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    g = Github(token)
-    repository = g.get_repo(repo)
+    repository = get_repo(repo, write=True)
     pr = repository.get_pull(pr_number)
 
     # Merge PR
@@ -204,15 +206,28 @@ def merge_pr(
     )
 
     if result.merged:
+        invalidate("issues", repo)
+        invalidate("branches", repo)
+        invalidate("tree", repo)
         print(f"✓ Merged PR #{pr_number} using {merge_method} method")
         print(f"  Commit SHA: {result.sha}")
 
         # Delete branch if requested
         if delete_branch:
             try:
-                ref = repository.get_git_ref(f"heads/{pr.head.ref}")
-                ref.delete()
+                call(
+                    lambda: repository.get_git_ref(f"heads/{pr.head.ref}").delete(),
+                    "git.refs.delete", idempotent=True,
+                )
+                invalidate("branches", repo)
                 print(f"✓ Deleted branch: {pr.head.ref}")
+            except GithubException as e:
+                if e.status in (404, 422):
+                    # Already gone (e.g., auto-deleted on merge or an earlier attempt)
+                    invalidate("branches", repo)
+                    print(f"✓ Branch already deleted: {pr.head.ref}")
+                else:
+                    print(f"⚠ Could not delete branch: {e}")
             except Exception as e:
                 print(f"⚠ Could not delete branch: {e}")
     else:
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+GitHub credentials available to the helpers.
+
+Besides ``GITHUB_PERSONAL_ACCESS_TOKEN``, more credentials can be added so
+that reads are spread over several rate-limit budgets
+(``github_client.get_github_client`` picks one per request):
+
+- ``GITHUB_TOKENS``: further personal access tokens, comma separated
+- ``GITHUB_APP_ID`` with ``GITHUB_APP_PRIVATE_KEY`` (PEM text) or
+  ``GITHUB_APP_PRIVATE_KEY_PATH``: a GitHub App; one credential per
+  installation (all installations, or those in
+  ``GITHUB_APP_INSTALLATION_IDS``), limited to the installation's account
+
+Installation tokens are minted on first use, kept in memory only, and
+minted again APP_TOKEN_MARGIN seconds before they expire.
+
+Usage:
+    from credentials import load_credentials
+
+    for credential in load_credentials():
+        print(credential.name, credential.owner)
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+from github import Auth, GithubIntegration
+
+if __package__:
+    from .resilience import call, transport_retry
+else:
+    from resilience import call, transport_retry
+
+# Seconds before expiry at which an installation token is replaced.
+APP_TOKEN_MARGIN = float(os.environ.get("GITHUB_APP_TOKEN_MARGIN", "300"))
+
+ENV_VARS = (
+    "GITHUB_PERSONAL_ACCESS_TOKEN",
+    "GITHUB_TOKENS",
+    "GITHUB_APP_ID",
+    "GITHUB_APP_PRIVATE_KEY",
+    "GITHUB_APP_PRIVATE_KEY_PATH",
+    "GITHUB_APP_INSTALLATION_IDS",
+)
+
+
+class Credential:
+    """
+    One identity with its own rate-limit budgets.
+
+    Credentials compare by identity; ``name`` is only for display and need
+    not be unique (two tokens can end in the same four characters).
+    """
+
+    __slots__ = ("name", "auth", "owner")
+
+    def __init__(self, name: str, auth: Auth.Auth, owner: str = None):
+        self.name = name
+        self.auth = auth
+        # Installation credentials only reach repositories of their account
+        self.owner = owner.lower() if owner else None
+
+    def can_access(self, owner: str = None) -> bool:
+        """Check whether this credential can be used for an owner's repos."""
+        return self.owner is None or owner is None or self.owner == owner.lower()
+
+
+class InstallationAuth(Auth.Auth):
+    """Installation access token that is minted again shortly before expiry."""
+
+    def __init__(self, integration: GithubIntegration, installation_id: int):
+        self.installation_id = installation_id
+        self._integration = integration
+        self._token = None
+        self._expires_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def token_type(self) -> str:
+        return "token"
+
+    @property
+    def token(self) -> str:
+        with self._lock:
+            margin = timedelta(seconds=APP_TOKEN_MARGIN)
+            if self._token is None or self._expires_at - margin <= datetime.now(timezone.utc):
+                authorization = call(
+                    lambda: self._integration.get_access_token(self.installation_id),
+                    "apps.installation_token",
+                )
+                self._token = authorization.token
+                self._expires_at = authorization.expires_at
+                print(f"✓ Minted token for installation {self.installation_id}")
+            return self._token
+
+    @property
+    def _masked_token(self) -> str:
+        return f"token (installation {self.installation_id})"
+
+
+def load_credentials() -> List[Credential]:
+    """
+    Build the credentials configured in the environment.
+
+    The personal access token comes first, then GITHUB_TOKENS, then App
+    installations; the first credential is the default write identity.
+
+    Returns:
+        List of Credential objects
+    """
+    credentials = []
+    tokens = [os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN", "")]
+    tokens += os.environ.get("GITHUB_TOKENS", "").replace(",", " ").split()
+    for token in dict.fromkeys(t.strip() for t in tokens if t.strip()):
+        credentials.append(Credential(f"token ...{token[-4:]}", Auth.Token(token)))
+
+    app_id = os.environ.get("GITHUB_APP_ID")
+    if app_id:
+        credentials.extend(_app_credentials(app_id))
+
+    if not credentials:
+        raise ValueError(
+            "No GitHub credentials configured: set GITHUB_PERSONAL_ACCESS_TOKEN "
+            "(or GITHUB_TOKENS, or GITHUB_APP_ID with a private key)"
+        )
+    return credentials
+
+
+def _app_credentials(app_id: str) -> List[Credential]:
+    """One credential per installation of the configured GitHub App."""
+    private_key = os.environ.get("GITHUB_APP_PRIVATE_KEY")
+    key_path = os.environ.get("GITHUB_APP_PRIVATE_KEY_PATH")
+    if not private_key and key_path:
+        private_key = Path(key_path).expanduser().read_text()
+    if not private_key:
+        raise ValueError(
+            "GITHUB_APP_ID is set but neither GITHUB_APP_PRIVATE_KEY nor "
+            "GITHUB_APP_PRIVATE_KEY_PATH is"
+        )
+
+    integration = GithubIntegration(
+        auth=Auth.AppAuth(app_id, private_key), retry=transport_retry()
+    )
+    wanted = os.environ.get("GITHUB_APP_INSTALLATION_IDS", "").replace(",", " ").split()
+    if wanted:
+        installations = [
+            call(lambda i=int(i): integration.get_app_installation(i),
+                 "apps.installations", idempotent=True)
+            for i in wanted
+        ]
+    else:
+        installations = call(lambda: list(integration.get_installations()),
+                             "apps.installations", idempotent=True)
+
+    return [
+        Credential(
+            f"app {app_id} installation {installation.id}",
+            InstallationAuth(integration, installation.id),
+            owner=installation.account.login if installation.account else None,
+        )
+        for installation in installations
+    ]
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Warm helper daemon serving the helper scripts over a Unix socket.
+
+A long-running ``serve`` process keeps the pooled GitHub client, repository
+handles and response caches from ``github_client`` warm, so repeated calls
+skip interpreter start-up, imports, authentication and ``get_repo``.
+
+Protocol: one JSON object per line in each direction.
+    request:  {"op": "create_issue", "kwargs": {"repo": "owner/repo", "title": "..."}}
+    response: {"ok": true, "result": {...}}
+              {"ok": false, "error": "...", "type": "GithubException", "status": 422}
+
+Results are the JSON payloads GitHub returned for the objects (lists of them
+for listings), so the daemon and the in-process fallback return the same data.
+
+Usage:
+    python daemon.py serve
+    python daemon.py call create_issue '{"repo": "owner/repo", "title": "Bug"}'
+
+    from daemon import call
+
+    issue = call("create_issue", repo="owner/repo", title="Bug: Login fails")
+    print(issue["html_url"])
+"""
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+from datetime import datetime
+
+# Where the daemon listens; override with GITHUB_DEV_TOOLS_SOCKET.
+SOCKET_PATH = os.environ.get(
+    "GITHUB_DEV_TOOLS_SOCKET",
+    os.path.join(
+        os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir()),
+        f"github-dev-tools-{os.getuid() if hasattr(os, 'getuid') else 0}.sock",
+    ),
+)
+
+# Seconds the thin client waits for a single operation to finish.
+CALL_TIMEOUT = float(os.environ.get("GITHUB_DEV_TOOLS_CALL_TIMEOUT", "300"))
+
+_operations = None
+
+
+class DaemonError(Exception):
+    """Error raised by an operation executed inside the daemon."""
+
+    def __init__(self, message: str, error_type: str = None, status: int = None):
+        super().__init__(message)
+        self.error_type = error_type
+        self.status = status
+
+
+def get_operations():
+    """
+    Map operation names to helper functions.
+
+    Helper modules are imported on first use so the thin client stays
+    stdlib-only while the daemon is running.
+
+    Returns:
+        Dict of operation name to callable
+    """
+    global _operations
+    if _operations is None:
+        if __package__:
+            from . import create_issue, create_pr, dedupe, models
+            from . import repo_operations, resilience, webhooks
+            from .github_client import credential_status, invalidate
+        else:
+            import create_issue
+            import create_pr
+            import dedupe
+            import models
+            import repo_operations
+            import resilience
+            import webhooks
+            from github_client import credential_status, invalidate
+
+        _operations = {
+            "create_issue": create_issue.create_issue,
+            "update_issue": create_issue.update_issue,
+            "add_issue_comment": create_issue.add_issue_comment,
+            "close_issue": create_issue.close_issue,
+            "search_issues": create_issue.search_issues,
+            "list_issues": create_issue.list_issues,
+            "find_duplicates": dedupe.find_duplicates,
+            "create_pull_request": create_pr.create_pull_request,
+            "update_pr": create_pr.update_pr,
+            "merge_pr": create_pr.merge_pr,
+            "create_repository": repo_operations.create_repository,
+            "create_branch": repo_operations.create_branch,
+            "push_multiple_files": repo_operations.push_multiple_files,
+            "push_commits": repo_operations.push_commits,
+            "delete_file": repo_operations.delete_file,
+            "get_file_contents": repo_operations.get_file_contents,
+            "search_code": repo_operations.search_code,
+            "fork_repository": repo_operations.fork_repository,
+            "list_branches": repo_operations.list_branches,
+            "create_branches": repo_operations.create_branches,
+            "list_refs": repo_operations.list_refs,
+            "cleanup_branches": repo_operations.cleanup_branches,
+            "get_repository_tree": repo_operations.get_repository_tree,
+            "list_issues_fast": models.list_issues_fast,
+            "list_branches_fast": models.list_branches_fast,
+            "get_repository_tree_fast": models.get_repository_tree_fast,
+            "search_code_fast": models.search_code_fast,
+            "invalidate": invalidate,
+            "credential_status": credential_status,
+            "replay_webhooks": webhooks.replay,
+            "resilience_stats": resilience.stats,
+        }
+    return _operations
+
+
+def to_json(value):
+    """Convert helper results (PyGithub objects, lists, dates) to JSON data."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    as_dict = getattr(value, "as_dict", None)
+    if as_dict is not None:
+        return to_json(as_dict())
+    # Use the payload PyGithub already holds; the public raw_data property
+    # would trigger a lazy completion GET for every listed object.
+    raw = getattr(value, "_rawData", None)
+    if raw is not None:
+        return to_json(raw)
+    return str(value)
+
+
+def execute(op: str, kwargs: dict = None):
+    """
+    Run an operation in this process and return its JSON-ready result.
+
+    Args:
+        op: Operation name (e.g., "create_issue", "push_multiple_files")
+        kwargs: Keyword arguments for the helper function
+
+    Returns:
+        JSON-serializable result
+    """
+    if op == "ping":
+        return {"pid": os.getpid()}
+
+    operations = get_operations()
+    if op not in operations:
+        raise ValueError(f"Unknown operation: {op}")
+    return to_json(operations[op](**(kwargs or {})))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serve newline-delimited JSON requests on one connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                result = execute(request["op"], request.get("kwargs"))
+                response = {"ok": True, "result": result}
+            except Exception as e:
+                response = {
+                    "ok": False,
+                    "error": str(e),
+                    "type": type(e).__name__,
+                    "status": getattr(e, "status", None),
+                }
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path: str = None, webhook_port: int = None):
+    """
+    Run the daemon in the foreground until interrupted.
+
+    Args:
+        socket_path: Unix socket path (defaults to SOCKET_PATH)
+        webhook_port: Also run the webhook receiver (see webhooks.py) on
+                      this port so deliveries update the daemon's caches
+    """
+    socket_path = socket_path or SOCKET_PATH
+
+    if os.path.exists(socket_path):
+        if _is_running(socket_path):
+            raise RuntimeError(f"Daemon already running on {socket_path}")
+        os.unlink(socket_path)
+
+    # Import helpers and authenticate up front so the first call is warm too
+    get_operations()
+    if __package__:
+        from .github_client import get_github_client
+        from .webhooks import start_receiver
+    else:
+        from github_client import get_github_client
+        from webhooks import start_receiver
+    get_github_client()
+
+    if webhook_port:
+        start_receiver(webhook_port)
+
+    server = _Server(socket_path, _Handler)
+    os.chmod(socket_path, 0o600)
+    print(f"✓ Serving helper operations on {socket_path}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        print("✓ Daemon stopped")
+
+
+def call(op: str, **kwargs):
+    """
+    Run an operation through the daemon, or in-process if it is not running.
+
+    Args:
+        op: Operation name (e.g., "create_issue", "list_branches")
+        **kwargs: Keyword arguments for the helper function
+
+    Returns:
+        JSON-serializable result
+    """
+    try:
+        conn = _connect(SOCKET_PATH)
+    except OSError:
+        return execute(op, kwargs)
+
+    with conn:
+        conn.sendall(json.dumps({"op": op, "kwargs": kwargs}).encode("utf-8") + b"\n")
+        response = json.loads(_read_line(conn))
+
+    if not response["ok"]:
+        raise DaemonError(response["error"], response.get("type"), response.get("status"))
+    return response["result"]
+
+
+def _connect(socket_path: str):
+    """Open a client connection to the daemon socket."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not supported on this platform")
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(CALL_TIMEOUT)
+    try:
+        conn.connect(socket_path)
+    except OSError:
+        conn.close()
+        raise
+    return conn
+
+
+def _read_line(conn) -> bytes:
+    """Read one newline-terminated response from the socket."""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return b"".join(chunks)
+
+
+def _is_running(socket_path: str) -> bool:
+    """Check whether a daemon is accepting connections on socket_path."""
+    try:
+        _connect(socket_path).close()
+        return True
+    except OSError:
+        return False
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("serve", "call", "ping"):
+        print("Usage:")
+        print("  python daemon.py serve [socket-path] [--webhook-port PORT]")
+        print("  python daemon.py call <operation> [json-kwargs]")
+        print("  python daemon.py ping")
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command == "serve":
+        port = int(sys.argv[sys.argv.index("--webhook-port") + 1]) if "--webhook-port" in sys.argv else None
+        path = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else None
+        serve(path, webhook_port=port)
+
+    elif command == "call":
+        op = sys.argv[2]
+        kwargs = json.loads(sys.argv[3]) if len(sys.argv) > 3 else {}
+        print(json.dumps(call(op, **kwargs), indent=2))
+
+    elif command == "ping":
+        if _is_running(SOCKET_PATH):
+            print(f"✓ Daemon running on {SOCKET_PATH} (pid {call('ping')['pid']})")
+        else:
+            print(f"✗ No daemon on {SOCKET_PATH}")
+            sys.exit(1)
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Local near-duplicate detection for issues.
+
+Searching before every create costs a search request (30 per minute).
+Instead, a MinHash/LSH index over the titles and bodies of a repository's
+issues is kept on disk and in memory:
+
+- each issue is reduced to a set of normalized words (title words count
+  twice; stop words, template boilerplate and HTML comments are ignored)
+  and a MinHash signature of NUM_HASHES values
+- signatures are split into BANDS bands; issues sharing any band are
+  candidates, ranked by the fraction of matching signature values
+- the index is updated incrementally with a ``since=`` listing (one
+  request for a quiet repo) at most every REFRESH_INTERVAL seconds; a
+  stale index answers lookups while a background thread refreshes it, so
+  only the very first build of an index waits for the API
+- only open issues count as duplicates unless ``state`` says otherwise
+
+Usage:
+    from dedupe import find_duplicates
+
+    for match in find_duplicates("owner/repo", "Login fails on Safari", body):
+        print(match["number"], match["similarity"], match["title"])
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import struct
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+if __package__:
+    from .github_client import CACHE_DIR
+    from .models import IssueRecord, list_issues_fast
+    from .templates import boilerplate_lines
+else:
+    from github_client import CACHE_DIR
+    from models import IssueRecord, list_issues_fast
+    from templates import boilerplate_lines
+
+NUM_HASHES = 96
+BANDS = 32  # 3 values per band: almost every issue 50% similar is a candidate
+
+SIMILARITY_THRESHOLD = float(os.environ.get("GITHUB_DEDUPE_THRESHOLD", "0.5"))
+REFRESH_INTERVAL = float(os.environ.get("GITHUB_DEDUPE_REFRESH", "300"))
+
+# Only the start of long bodies is compared (logs and traces add noise)
+MAX_WORDS = 400
+
+# Each salted 64-byte blake2b digest gives 16 independent 32-bit hash values
+_SALTS = [bytes([i]) * 16 for i in range(NUM_HASHES // 16)]
+_UNPACK = struct.Struct("<16I").unpack
+_ROWS = NUM_HASHES // BANDS
+
+_WORD = re.compile(r"[a-z0-9]{2,}")
+_STOP_WORDS = frozenset(
+    "an and are as at be but by can do does for from has have if in is it its "
+    "no not of on or so that the this to was we when where which while with "
+    "you your my me our after before then there what will would should".split()
+)
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def shingles(title: str, body: str = None) -> set:
+    """
+    Reduce an issue to its normalized words.
+
+    Args:
+        title: Issue title
+        body: Issue body
+
+    Returns:
+        Set of words (title words also appear with a "title:" prefix)
+    """
+    boilerplate = _without_comments(boilerplate_lines())
+    text = "\n".join(
+        line for line in _COMMENT.sub("", body or "").splitlines()
+        if line.strip() not in boilerplate
+    )
+    title_words = {_stem(w) for w in _WORD.findall(title.lower()) if w not in _STOP_WORDS}
+    body_words = {
+        _stem(w) for w in _WORD.findall(text.lower())[:MAX_WORDS] if w not in _STOP_WORDS
+    }
+    return body_words | title_words | {f"title:{w}" for w in title_words}
+
+
+def signature(words: set) -> tuple:
+    """
+    Compute the MinHash signature of a word set.
+
+    Args:
+        words: Words from shingles()
+
+    Returns:
+        Tuple of NUM_HASHES values (None for an empty set)
+    """
+    if not words:
+        return None
+    return tuple(map(min, zip(*map(_hash_values, words))))
+
+
+@functools.lru_cache(maxsize=65536)
+def _hash_values(word: str) -> tuple:
+    """NUM_HASHES independent hash values of a word."""
+    data = word.encode("utf-8")
+    values = ()
+    for salt in _SALTS:
+        values += _UNPACK(hashlib.blake2b(data, salt=salt).digest())
+    return values
+
+
+@functools.lru_cache(maxsize=4)
+def _without_comments(lines: frozenset) -> frozenset:
+    """Template lines as they read once HTML comments are removed."""
+    return frozenset(_COMMENT.sub("", line).strip() for line in lines)
+
+
+def _stem(word: str) -> str:
+    """Strip common English suffixes so "crashes" matches "crashed"."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+class DuplicateIndex:
+    """MinHash/LSH index of one repository's issues."""
+
+    def __init__(self, repo: str):
+        self.repo = repo
+        owner, name = repo.lower().split("/")
+        self.path = CACHE_DIR / f"dedupe-{owner}-{name}.json"
+        self.synced_at = None
+        self.refreshed_at = None
+        self.issues = {}
+        self._buckets = [{} for _ in range(BANDS)]
+        self._lock = threading.Lock()
+        # Held while listing from GitHub; lookups only need _lock
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    @classmethod
+    def load(cls, repo: str):
+        """Load the saved index of repo (empty if there is none)."""
+        index = cls(repo)
+        if index.path.exists():
+            data = json.loads(index.path.read_text())
+            index.synced_at = data["synced_at"]
+            for number, (title, state, url, sig) in data["issues"].items():
+                index._put(int(number), title, state, url, tuple(sig))
+        return index
+
+    def save(self):
+        """Atomically write the index to its cache file."""
+        with self._lock:
+            data = {
+                "repo": self.repo,
+                "synced_at": self.synced_at,
+                "issues": {
+                    number: [i["title"], i["state"], i["url"], i["sig"]]
+                    for number, i in self.issues.items()
+                },
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, max_age: float = None) -> bool:
+        """
+        Add issues created or edited since the last sync.
+
+        The first refresh lists every issue; later ones only fetch what
+        changed. Pull requests are skipped. Lookups keep working meanwhile.
+
+        Args:
+            max_age: Skip the refresh if another one finished within this
+                     many seconds (e.g. while this call waited for it)
+
+        Returns:
+            Whether the index was refreshed
+        """
+        with self._refresh_lock:
+            if max_age is not None and not self.is_stale(max_age):
+                return False
+            # Overlap by a minute so clock skew never drops an update
+            started = datetime.now(timezone.utc) - timedelta(minutes=1)
+            for record in list_issues_fast(self.repo, state="all", since=self.synced_at):
+                if not record.is_pull_request:
+                    self.add(record)
+            self.synced_at = started.strftime("%Y-%m-%dT%H:%M:%SZ")
+            self.refreshed_at = time.monotonic()
+            self.save()
+        print(f"✓ Duplicate index of {self.repo} has {len(self.issues)} issues")
+        return True
+
+    def refresh_in_background(self):
+        """Start a refresh on a daemon thread unless one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self._background_refresh, name=f"dedupe-{self.repo}", daemon=True
+        ).start()
+
+    def is_stale(self, max_age: float) -> bool:
+        """Check whether the index was not refreshed in this process in max_age seconds."""
+        return self.refreshed_at is None or time.monotonic() - self.refreshed_at > max_age
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"⚠ Could not refresh duplicate index of {self.repo}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def add(self, record: IssueRecord):
+        """Index an issue, replacing an earlier version of it."""
+        sig = signature(shingles(record.title, record.body))
+        with self._lock:
+            self._remove(record.number)
+            if sig is not None:
+                self._put(record.number, record.title, record.state, record.html_url, sig)
+
+    def query(self, title: str, body: str = None, threshold: float = SIMILARITY_THRESHOLD,
+              limit: int = 5, state: str = "open") -> List[Dict]:
+        """
+        Find indexed issues similar to a new one.
+
+        Args:
+            title: Title of the new issue
+            body: Body of the new issue
+            threshold: Minimum estimated similarity (0..1)
+            limit: Maximum number of matches
+            state: Only match issues in this state: "open", "closed", or "all"
+
+        Returns:
+            List of {"number", "title", "state", "url", "similarity"}, best first
+        """
+        sig = signature(shingles(title, body))
+        if sig is None:
+            return []
+
+        with self._lock:
+            candidates = set()
+            for band, buckets in enumerate(self._buckets):
+                candidates.update(buckets.get(sig[band * _ROWS:(band + 1) * _ROWS], ()))
+
+            matches = []
+            for number in candidates:
+                issue = self.issues[number]
+                if state != "all" and issue["state"] != state:
+                    continue
+                similarity = sum(x == y for x, y in zip(sig, issue["sig"])) / NUM_HASHES
+                if similarity >= threshold:
+                    matches.append({
+                        "number": number,
+                        "title": issue["title"],
+                        "state": issue["state"],
+                        "url": issue["url"],
+                        "similarity": similarity,
+                    })
+
+        matches.sort(key=lambda m: (-m["similarity"], -m["number"]))
+        return matches[:limit]
+
+    def _put(self, number, title, state, url, sig):
+        self.issues[number] = {"title": title, "state": state, "url": url, "sig": sig}
+        for band, buckets in enumerate(self._buckets):
+            buckets.setdefault(sig[band * _ROWS:(band + 1) * _ROWS], set()).add(number)
+
+    def _remove(self, number):
+        issue = self.issues.pop(number, None)
+        if issue is None:
+            return
+        for band, buckets in enumerate(self._buckets):
+            key = issue["sig"][band * _ROWS:(band + 1) * _ROWS]
+            buckets[key].discard(number)
+            if not buckets[key]:
+                del buckets[key]
+
+
+def get_index(repo: str, max_age: float = REFRESH_INTERVAL, wait: bool = False) -> DuplicateIndex:
+    """
+    Get the duplicate index of a repository, kept in memory after first use.
+
+    A stale index is returned as is while it refreshes in the background;
+    only an index that was never synced is built before returning.
+
+    Args:
+        repo: Repository in format "owner/repo"
+        max_age: Refresh from GitHub if not refreshed in this many seconds
+                 in this process (None to use the saved index as is)
+        wait: Refresh a stale index before returning it
+
+    Returns:
+        DuplicateIndex
+    """
+    # The global lock only guards the dict; loading and refreshing one
+    # repository's index never blocks lookups in another
+    with _lock:
+        index = _indexes.get(repo.lower())
+    if index is None:
+        loaded = DuplicateIndex.load(repo)
+        with _lock:
+            index = _indexes.setdefault(repo.lower(), loaded)
+
+    if max_age is not None and index.is_stale(max_age):
+        if wait or index.synced_at is None:
+            index.refresh(max_age)
+        else:
+            index.refresh_in_background()
+    return index
+
+
+def find_duplicates(repo: str, title: str, body: str = None,
+                    threshold: float = SIMILARITY_THRESHOLD, limit: int = 5,
+                    max_age: float = REFRESH_INTERVAL, state: str = "open") -> List[Dict]:
+    """
+    Find existing issues that look like duplicates of a new one.
+
+    Args:
+        repo: Repository in format "owner/repo"
+        title: Title of the new issue
+        body: Body of the new issue
+        threshold: Minimum estimated similarity (0..1)
+        limit: Maximum number of matches
+        max_age: See get_index
+        state: Only match issues in this state: "open", "closed", or "all"
+
+    Returns:
+        List of {"number", "title", "state", "url", "similarity"}, best first
+    """
+    return get_index(repo, max_age).query(title, body, threshold, limit, state)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ("build", "check"):
+        print("Usage:")
+        print("  python dedupe.py build <repo>")
+        print("  python dedupe.py check <repo> <title> [body]")
+        sys.exit(1)
+
+    repo = sys.argv[2]
+    if sys.argv[1] == "build":
+        get_index(repo, max_age=0, wait=True)
+    else:
+        body = sys.argv[4] if len(sys.argv) > 4 else None
+        matches = find_duplicates(repo, sys.argv[3], body, state="all")
+        for m in matches:
+            print(f"  #{m['number']} ({m['similarity']:.0%}, {m['state']}): {m['title']}")
+        if not matches:
+            print("No likely duplicates")
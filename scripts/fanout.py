@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Run the same helper pipeline across every repository in an organization.
+
+The organization's repositories are listed once and cached on disk. Each
+repository then runs the pipeline steps in order on a bounded thread pool;
+a failing repository is recorded and does not affect the others. Every
+finished step is appended to a JSONL journal, so rerunning an interrupted
+sweep with the same journal only runs the steps that have not finished.
+
+Usage:
+    from fanout import config_pr_pipeline, sweep_org
+
+    sweep_org(
+        "myorg",
+        config_pr_pipeline(
+            branch="chore/add-codeowners",
+            files=[{"path": ".github/CODEOWNERS", "content": "* @myorg/devs"}],
+            message="chore: add CODEOWNERS",
+            title="chore: add CODEOWNERS",
+        ),
+        journal="codeowners-sweep.jsonl",
+    )
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+if __package__:
+    from .github_client import CACHE_DIR, RatePacer, get_github_client, get_repo
+    from .idempotency import create_branch_once, create_pull_request_once
+    from .repo_operations import push_multiple_files
+else:
+    from github_client import CACHE_DIR, RatePacer, get_github_client, get_repo
+    from idempotency import create_branch_once, create_pull_request_once
+    from repo_operations import push_multiple_files
+
+Step = Tuple[str, Callable[[str, Dict[str, Any]], Any]]
+
+
+def list_org_repos(
+    org: str,
+    include_archived: bool = False,
+    include_forks: bool = True,
+    refresh: bool = False,
+):
+    """
+    List an organization's repositories, cached on disk after the first call.
+
+    Args:
+        org: Organization login
+        include_archived: Include archived (read-only) repositories
+        include_forks: Include forked repositories
+        refresh: Ignore the cached list and fetch it again
+
+    Returns:
+        List of "owner/repo" names
+    """
+    cache_path = CACHE_DIR / f"org-{org.lower()}-repos.json"
+
+    if cache_path.exists() and not refresh:
+        repos = json.loads(cache_path.read_text())
+    else:
+        g = get_github_client()
+        repos = [
+            {"full_name": r.full_name, "archived": r.archived, "fork": r.fork}
+            for r in g.get_organization(org).get_repos(type="all")
+        ]
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(repos))
+
+    names = [
+        r["full_name"]
+        for r in repos
+        if (include_archived or not r["archived"]) and (include_forks or not r["fork"])
+    ]
+    print(f"Found {len(names)} repositories in {org}")
+    return names
+
+
+def sweep_org(
+    org: str,
+    pipeline: List[Step],
+    journal: str,
+    repos: List[str] = None,
+    max_workers: int = 8,
+    writes_per_minute: float = 60,
+):
+    """
+    Run a pipeline of steps against many repositories.
+
+    Each step is a ``(name, fn)`` pair. ``fn(repo_name, context)`` receives
+    the results of earlier steps for the same repository in ``context`` (keyed
+    by step name) and must return something JSON-serializable.
+
+    Args:
+        org: Organization login (repositories are listed via list_org_repos)
+        pipeline: Ordered list of (step_name, fn) pairs
+        journal: JSONL file recording finished steps; reuse it to resume
+        repos: Explicit "owner/repo" names instead of the whole organization
+        max_workers: Number of repositories processed concurrently
+        writes_per_minute: Pace of steps across all workers
+
+    Returns:
+        Dict of repo name to "done" or "failed"
+    """
+    repos = repos if repos is not None else list_org_repos(org)
+    finished = _load_journal(journal)
+    step_names = [name for name, _ in pipeline]
+
+    pending = [
+        r for r in repos
+        if not all(name in finished.get(r, {}) for name in step_names)
+    ]
+    if len(pending) < len(repos):
+        print(f"Resuming from {journal}: {len(repos) - len(pending)} repositories already done")
+
+    pacer = RatePacer(per_minute=writes_per_minute)
+    lock = threading.Lock()
+
+    def record(entry):
+        with lock, open(journal, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def run(repo_name):
+        context = dict(finished.get(repo_name, {}))
+        for name, fn in pipeline:
+            if name in context:
+                continue
+            try:
+                pacer.wait()
+                context[name] = fn(repo_name, context)
+            except Exception as e:
+                print(f"✗ {repo_name}: step '{name}' failed: {e}")
+                record({"repo": repo_name, "step": name, "status": "failed", "error": str(e)})
+                return repo_name, "failed"
+            record({"repo": repo_name, "step": name, "status": "done", "result": context[name]})
+        return repo_name, "done"
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes = dict(pool.map(run, pending))
+
+    results = {r: outcomes.get(r, "done") for r in repos}
+    failed = sum(1 for status in results.values() if status == "failed")
+    print(f"✓ Sweep finished: {len(results) - failed} done, {failed} failed")
+    return results
+
+
+def config_pr_pipeline(
+    branch: str,
+    files: List[Dict[str, str]],
+    message: str,
+    title: str,
+    body: str = None,
+    base: str = None,
+) -> List[Step]:
+    """
+    Build the common branch -> push files -> open PR pipeline.
+
+    Branch and PR creation go through the idempotent wrappers, so a step
+    that timed out after GitHub applied it is reconciled rather than failing
+    with 422 when the sweep is resumed.
+
+    Args:
+        branch: Branch to create in every repository
+        files: Files to push, as for push_multiple_files
+        message: Commit message
+        title: Pull request title
+        body: Pull request body
+        base: Base branch (defaults to each repository's default branch)
+
+    Returns:
+        Pipeline for sweep_org
+    """
+    def make_branch(repo_name, context):
+        return create_branch_once(repo_name, branch, base).ref
+
+    def push(repo_name, context):
+        return push_multiple_files(repo_name, files, message, branch=branch).sha
+
+    def open_pr(repo_name, context):
+        pr = create_pull_request_once(
+            repo=repo_name,
+            title=title,
+            head=branch,
+            base=base or get_repo(repo_name).default_branch,
+            body=body,
+        )
+        return {"number": pr.number, "url": pr.html_url}
+
+    return [("branch", make_branch), ("push", push), ("pull_request", open_pr)]
+
+
+def _load_journal(path: str):
+    """Read finished step results per repository from a journal file."""
+    finished = {}
+    if not os.path.exists(path):
+        return finished
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry["status"] == "done":
+                finished.setdefault(entry["repo"], {})[entry["step"]] = entry["result"]
+    return finished
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ("repos", "config-pr"):
+        print("Usage:")
+        print("  python fanout.py repos <org> [--refresh]")
+        print("  python fanout.py config-pr <org> <branch> <repo-path> <local-file> <title> --journal FILE")
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command == "repos":
+        for name in list_org_repos(sys.argv[2], refresh="--refresh" in sys.argv):
+            print(f"  - {name}")
+
+    elif command == "config-pr":
+        org, branch, repo_path, local_file, title = sys.argv[2:7]
+        journal = sys.argv[sys.argv.index("--journal") + 1] if "--journal" in sys.argv else f"{org}-{branch.replace('/', '-')}.jsonl"
+        sweep_org(
+            org,
+            config_pr_pipeline(
+                branch=branch,
+                files=[{"path": repo_path, "content": Path(local_file).read_text()}],
+                message=title,
+                title=title,
+            ),
+            journal=journal,
+        )
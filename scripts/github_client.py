@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Shared GitHub client, repository handles and response cache.
+
+Every helper module goes through this module instead of building its own
+``Github`` instance, so a long-running process (see ``daemon.py``) keeps
+pooled HTTP clients, repository handles and recently read listings warm
+across calls.
+
+With several credentials configured (see ``credentials.py``), each request
+goes to the credential with the most remaining budget in its rate-limit
+bucket ("core", "search", "code_search", "graphql"), while writes stay with
+one identity (the first credential that can reach the repository).
+
+Usage:
+    from github_client import get_github_client, get_repo, cached, invalidate
+
+    repo = get_repo("owner/repo")
+    writable = get_repo("owner/repo", write=True)
+    branches = cached(("branches", "owner/repo"), lambda: list(repo.get_branches()))
+    invalidate("branches", "owner/repo")
+"""
+
+from github import Github
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+if __package__:
+    from .credentials import ENV_VARS, load_credentials
+    from .resilience import call, transport_retry
+else:
+    from credentials import ENV_VARS, load_credentials
+    from resilience import call, transport_retry
+
+# Seconds a cached listing stays valid; 0 disables the response cache.
+CACHE_TTL = float(os.environ.get("GITHUB_CACHE_TTL", "60"))
+
+# Seconds a Repository handle (default branch, permissions, ...) is reused.
+REPO_TTL = float(os.environ.get("GITHUB_REPO_TTL", "600"))
+
+# Size of the urllib3 connection pool shared by concurrent helper calls.
+POOL_SIZE = int(os.environ.get("GITHUB_POOL_SIZE", "16"))
+
+# Where helpers keep on-disk state (repo lists, journals, indexes).
+CACHE_DIR = Path(os.environ.get(
+    "GITHUB_DEV_TOOLS_CACHE", Path.home() / ".cache" / "github-dev-tools"
+))
+
+_lock = threading.RLock()
+_credentials = {}
+_clients = {}
+_repos = {}
+_cache = {}
+
+
+def get_github_client(bucket: str = "core", write: bool = False, owner: str = None):
+    """
+    Get an authenticated, pooled GitHub client.
+
+    Each credential gets one client per rate-limit bucket, so the budget
+    PyGithub reads from response headers stays specific to that bucket.
+
+    Args:
+        bucket: Rate-limit bucket the requests count against
+                ("core", "search", "code_search", "graphql")
+        write: Use the write identity instead of the credential with the
+               most remaining budget
+        owner: Repository owner, to skip App installations of other accounts
+
+    Returns:
+        Github client
+    """
+    with _lock:
+        candidates = [c for c in _current_credentials() if c.can_access(owner)]
+        if not candidates:
+            raise ValueError(f"No configured GitHub credential can access {owner}'s repositories")
+
+        if write or len(candidates) == 1:
+            credential = candidates[0]
+        else:
+            budgets = [_remaining(c, bucket) for c in candidates]
+            if max(budgets) > 0:
+                credential = candidates[budgets.index(max(budgets))]
+            else:
+                # Everything is spent; the earliest reset comes back first
+                credential = min(
+                    candidates, key=lambda c: _client(c, bucket).requester.rate_limiting_resettime
+                )
+        return _client(credential, bucket)
+
+
+def credential_status() -> List[Dict]:
+    """
+    Report the last known budget of every credential and bucket.
+
+    Returns:
+        List of {"name", "owner", "buckets": {bucket: {"remaining", "limit", "reset"}}}
+    """
+    with _lock:
+        return [
+            {
+                "name": c.name,
+                "owner": c.owner,
+                "buckets": {
+                    bucket: {
+                        "remaining": client.requester.rate_limiting[0],
+                        "limit": client.requester.rate_limiting[1],
+                        "reset": client.requester.rate_limiting_resettime,
+                    }
+                    for (credential, bucket), client in _clients.items()
+                    if credential is c
+                },
+            }
+            for c in _current_credentials()
+        ]
+
+
+def get_repo(repo_name: str, write: bool = False):
+    """
+    Get a Repository handle, reusing one fetched in the last REPO_TTL seconds.
+
+    Requests made through the handle use the credential it was fetched with,
+    so helpers that modify the repository ask for ``write=True``.
+
+    Args:
+        repo_name: Repository in format "owner/repo"
+        write: Bind the handle to the write identity
+
+    Returns:
+        Repository object
+    """
+    g = get_github_client(write=write, owner=repo_name.split("/")[0])
+    key = (id(g), repo_name.lower())
+
+    now = time.monotonic()
+    with _lock:
+        entry = _repos.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    repo = call(lambda: g.get_repo(repo_name), "repos.get", idempotent=True)
+    with _lock:
+        _repos[key] = (now + REPO_TTL, repo)
+    return repo
+
+
+class RatePacer:
+    """
+    Spread requests from many threads evenly over time.
+
+    GitHub's secondary rate limits punish bursts of content-creating requests
+    (roughly 80 per minute), and PyGithub's own throttle is not shared safely
+    between threads. Call ``wait()`` before each write; it also sleeps until
+    the reset time when the primary budget drops below ``reserve``.
+    """
+
+    def __init__(self, per_minute: float = 60, reserve: int = 50):
+        self._interval = 60.0 / per_minute
+        self._reserve = reserve
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may send its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+        g = get_github_client(write=True)
+        remaining, _ = g.rate_limiting
+        if remaining < self._reserve:
+            pause = max(g.rate_limiting_resettime - time.time(), 0) + 1
+            print(f"⚠ Rate limit low ({remaining} left), pausing {pause:.0f}s")
+            time.sleep(pause)
+
+
+def cached(key: Tuple, loader: Callable[[], Any], ttl: Optional[float] = None):
+    """
+    Return the cached value for key, calling loader on a miss or expiry.
+
+    Keys are tuples of the form ``(kind, repo_name, *details)`` so that
+    ``invalidate`` can drop every entry of one kind for one repository.
+
+    Args:
+        key: Cache key, e.g. ("tree", "owner/repo", "main", True)
+        loader: Zero-argument callable producing the value
+        ttl: Seconds to keep the value (defaults to CACHE_TTL)
+
+    Returns:
+        Cached or freshly loaded value
+    """
+    ttl = CACHE_TTL if ttl is None else ttl
+    if ttl <= 0:
+        return loader()
+
+    key = _normalize_key(key)
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    value = loader()
+    with _lock:
+        _cache[key] = (now + ttl, value)
+    return value
+
+
+def cache_put(key: Tuple, value: Any, ttl: Optional[float] = None):
+    """Store value under key, replacing any existing entry."""
+    ttl = CACHE_TTL if ttl is None else ttl
+    with _lock:
+        _cache[_normalize_key(key)] = (time.monotonic() + ttl, value)
+
+
+def cache_update(kind: str, repo_name: str, update: Callable[[Tuple, Any], Any]):
+    """
+    Rewrite every live entry of one kind for one repository in place.
+
+    The read and the write happen under the cache lock, so concurrent
+    updates (e.g. webhook deliveries) cannot overwrite each other.
+    Expiry times are kept.
+
+    Args:
+        kind: Entry kind, e.g. "issues", "branches"
+        repo_name: Repository in format "owner/repo"
+        update: Called as update(key, value); returns the new value
+    """
+    now = time.monotonic()
+    prefix = (kind, repo_name.lower())
+    with _lock:
+        for key, (expires, value) in list(_cache.items()):
+            if key[:2] == prefix and expires > now:
+                _cache[key] = (expires, update(key, value))
+
+
+def cache_drop(key: Tuple):
+    """Drop a single cache entry if present."""
+    with _lock:
+        _cache.pop(_normalize_key(key), None)
+
+
+def cache_entries(kind: str, repo_name: str):
+    """
+    List live (key, value) pairs of one kind for one repository.
+
+    Args:
+        kind: Entry kind, e.g. "issues", "branches", "tree"
+        repo_name: Repository in format "owner/repo"
+
+    Returns:
+        List of (key, value) tuples
+    """
+    now = time.monotonic()
+    prefix = (kind, repo_name.lower())
+    with _lock:
+        return [
+            (key, entry[1])
+            for key, entry in _cache.items()
+            if key[:2] == prefix and entry[0] > now
+        ]
+
+
+def invalidate(kind: str = None, repo_name: str = None):
+    """
+    Drop cached entries.
+
+    Args:
+        kind: Only drop entries of this kind (default: all kinds); "repo"
+              drops Repository handles
+        repo_name: Only drop entries for this repository (default: all repos)
+    """
+    repo_key = repo_name.lower() if repo_name else None
+    with _lock:
+        if kind in (None, "repo"):
+            for key in list(_repos):
+                if not repo_key or key[1] == repo_key:
+                    del _repos[key]
+        for key in list(_cache):
+            if kind and key[0] != kind:
+                continue
+            if repo_key and key[1] != repo_key:
+                continue
+            del _cache[key]
+
+
+def clear_caches():
+    """Forget credentials, clients, repository handles and cached responses."""
+    with _lock:
+        _credentials.clear()
+        _clients.clear()
+        _repos.clear()
+        _cache.clear()
+
+
+def _current_credentials():
+    """Return the configured credentials, reloading them if the environment changed."""
+    env = tuple(os.environ.get(name) for name in ENV_VARS)
+    if env not in _credentials:
+        _credentials.clear()
+        _clients.clear()
+        _repos.clear()
+        _credentials[env] = load_credentials()
+    return _credentials[env]
+
+
+def _client(credential, bucket: str):
+    """Get (creating if needed) the client of a credential for one bucket."""
+    client = _clients.get((credential, bucket))
+    if client is None:
+        client = Github(auth=credential.auth, pool_size=POOL_SIZE, retry=transport_retry())
+        _clients[(credential, bucket)] = client
+    return client
+
+
+def _remaining(credential, bucket: str) -> float:
+    """Last known remaining budget; unknown or reset budgets count as full."""
+    client = _clients.get((credential, bucket))
+    if client is None:
+        return math.inf
+    # Read the requester's values; Github.rate_limiting would send a request
+    remaining, _ = client.requester.rate_limiting
+    if remaining < 0 or client.requester.rate_limiting_resettime <= time.time():
+        return math.inf
+    return remaining
+
+
+def _normalize_key(key: Tuple) -> Tuple:
+    """Lower-case the repository part of a cache key."""
+    return (key[0], key[1].lower()) + tuple(key[2:])
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Idempotent creates backed by a local SQLite write journal.
+
+A create that times out after GitHub applied it leaves the caller unsure
+whether to retry: retrying makes a duplicate issue, or fails with 422 for
+pull requests and branches. These wrappers derive a key for each write,
+record it in a journal before sending the request, and on retry check the
+journal first:
+
+- finished writes are returned from the journal without any request
+  (branches are first checked to still exist); entries older than
+  JOURNAL_TTL are ignored, so a later run reusing a branch name or
+  head/base pair creates a new branch or PR
+- unfinished writes are reconciled with a lookup (a marker hidden in the
+  issue/PR body, or the branch ref itself) before creating again
+
+Usage:
+    from idempotency import create_issue_once
+
+    issue = create_issue_once("owner/repo", "Bug: Login fails", body="...")
+    # Safe to call again: returns the same issue, no duplicate
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from github import GithubException
+from github.GitRef import GitRef
+from github.Issue import Issue
+from github.PullRequest import PullRequest
+
+if __package__:
+    from .create_issue import create_issue, load_template as load_issue_template
+    from .create_pr import create_pull_request, load_template as load_pr_template
+    from .github_client import CACHE_DIR, get_github_client, get_repo, invalidate
+    from .repo_operations import create_branch
+else:
+    from create_issue import create_issue, load_template as load_issue_template
+    from create_pr import create_pull_request, load_template as load_pr_template
+    from github_client import CACHE_DIR, get_github_client, get_repo, invalidate
+    from repo_operations import create_branch
+
+JOURNAL_PATH = CACHE_DIR / "writes.db"
+
+# Seconds a finished write answers retries with the same key (default 1 day).
+JOURNAL_TTL = float(os.environ.get("GITHUB_IDEMPOTENCY_TTL", "86400"))
+
+MARKER = "<!-- github-dev-tools:idempotency-key={key} -->"
+
+# Allowance for the local clock being ahead of GitHub's
+CLOCK_SKEW = timedelta(minutes=5)
+
+_lock = threading.Lock()
+
+
+def write_key(op: str, repo: str, **fields) -> str:
+    """
+    Derive a stable idempotency key for a write.
+
+    Args:
+        op: Kind of write ("issue", "pull_request", "branch")
+        repo: Repository in format "owner/repo"
+        **fields: Values that identify this particular write
+
+    Returns:
+        Hex key
+    """
+    material = json.dumps([op, repo.lower(), fields], sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+def create_issue_once(repo: str, title: str, body: str = None, body_template: str = None,
+                      key: str = None, **kwargs):
+    """
+    Create an issue at most once per key.
+
+    Args:
+        repo: Repository in format "owner/repo"
+        title: Issue title
+        body: Issue description
+        body_template: Template name used when body is not given
+        key: Idempotency key (defaults to one derived from repo, title, body)
+        **kwargs: Passed to create_issue (labels, assignees, milestone)
+
+    Returns:
+        Issue object (built from the journal when already created)
+    """
+    if body is None and body_template:
+        body = load_issue_template(body_template)
+    key = key or write_key("issue", repo, title=title, body=body)
+
+    def reconcile(started_at):
+        # Newest first, stopping at issues created before the attempt started.
+        # started_at is local time; the server filters since= by its own clock
+        earliest = datetime.fromisoformat(started_at) - CLOCK_SKEW
+        issues = get_repo(repo, write=True).get_issues(
+            state="all", sort="created", direction="desc", since=earliest,
+        )
+        marker = MARKER.format(key=key)
+        for issue in issues:
+            if issue.created_at < earliest:
+                return None
+            if marker in (issue.body or ""):
+                return issue
+        return None
+
+    def create():
+        return create_issue(repo, title, body=_with_marker(body, key), **kwargs)
+
+    return _run_once(key, "issue", repo, Issue, reconcile, create)
+
+
+def create_pull_request_once(repo: str, title: str, head: str, base: str = "main",
+                             body: str = None, body_template: str = None,
+                             key: str = None, **kwargs):
+    """
+    Open a pull request at most once per key.
+
+    Args:
+        repo: Repository in format "owner/repo"
+        title: PR title
+        head: Source branch name
+        base: Target branch name
+        body: PR description
+        body_template: Template name used when body is not given
+        key: Idempotency key (defaults to one derived from repo, head, base)
+        **kwargs: Passed to create_pull_request (draft, reviewers, labels, ...)
+
+    Returns:
+        PullRequest object (built from the journal when already created)
+    """
+    if body is None and body_template:
+        body = load_pr_template(body_template)
+    key = key or write_key("pull_request", repo, head=head, base=base)
+
+    def reconcile(started_at):
+        # GitHub allows one open PR per head/base pair, so filter server-side
+        owner = repo.split("/")[0]
+        pulls = get_repo(repo, write=True).get_pulls(
+            state="all", head=f"{owner}:{head}", base=base,
+        )
+        marker = MARKER.format(key=key)
+        return next((p for p in pulls if marker in (p.body or "")), None)
+
+    def create():
+        return create_pull_request(repo, title, head, base=base,
+                                   body=_with_marker(body, key), **kwargs)
+
+    return _run_once(key, "pull_request", repo, PullRequest, reconcile, create)
+
+
+def create_branch_once(repo: str, branch_name: str, from_branch: str = None,
+                       key: str = None):
+    """
+    Create a branch at most once per key.
+
+    An existing ref with the same name counts as the earlier attempt having
+    succeeded, so a retry after a timeout (or a 422 "Reference already
+    exists") returns the ref instead of failing.
+
+    Args:
+        repo: Repository in format "owner/repo"
+        branch_name: Name of the new branch
+        from_branch: Source branch (defaults to repository default branch)
+        key: Idempotency key (defaults to one derived from repo and branch)
+
+    Returns:
+        GitRef object (built from the journal when already created)
+    """
+    key = key or write_key("branch", repo, branch=branch_name)
+
+    def reconcile(started_at):
+        try:
+            return get_repo(repo, write=True).get_git_ref(f"heads/{branch_name}")
+        except GithubException as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def create():
+        return create_branch(repo, branch_name, from_branch)
+
+    # A finished branch may have been merged and deleted since
+    return _run_once(key, "branch", repo, GitRef, reconcile, create, verify=True)
+
+
+def _run_once(key, op, repo, klass, reconcile, create, verify=False):
+    """
+    Return the journaled result for key, reconciling or creating as needed.
+
+    reconcile() reads through the write identity, so whatever it finds can
+    be edited by the caller just like a freshly created object.
+    """
+    row = _journal_get(key)
+    g = get_github_client(write=True, owner=repo.split("/")[0])
+
+    if row and row["status"] == "done":
+        if time.time() - row["finished_at"] > JOURNAL_TTL:
+            row = _journal_forget(key)
+        elif verify:
+            found = reconcile(row["started_at"])
+            if found is not None:
+                print(f"✓ Already created ({op}, key {key[:8]})")
+                return found
+            row = _journal_forget(key)
+        else:
+            print(f"✓ Already created ({op}, key {key[:8]})")
+            return g.create_from_raw_data(klass, row["result"])
+
+    if row:
+        found = reconcile(row["started_at"])
+        if found is not None:
+            print(f"✓ Reconciled earlier {op} attempt (key {key[:8]})")
+            _journal_finish(key, found)
+            invalidate(None, repo)
+            return found
+
+    _journal_begin(key, op, repo)
+    try:
+        result = create()
+    except GithubException as e:
+        # A 422 on retry usually means the first attempt did land
+        if e.status != 422:
+            raise
+        result = reconcile(_journal_get(key)["started_at"])
+        if result is None:
+            raise
+        print(f"✓ Reconciled earlier {op} attempt (key {key[:8]})")
+
+    _journal_finish(key, result)
+    return result
+
+
+def _with_marker(body: str, key: str) -> str:
+    """Append the hidden idempotency marker to a body."""
+    return f"{body or ''}\n\n{MARKER.format(key=key)}".lstrip()
+
+
+def _execute(sql: str, params: tuple = ()):
+    """Run one statement against the journal database and return its rows."""
+    JOURNAL_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        conn = sqlite3.connect(JOURNAL_PATH, timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS writes ("
+                " key TEXT PRIMARY KEY, op TEXT, repo TEXT, status TEXT,"
+                " started_at TEXT, finished_at REAL, result TEXT)"
+            )
+            rows = conn.execute(sql, params).fetchall()
+            conn.commit()
+            return rows
+        finally:
+            conn.close()
+
+
+def _journal_get(key: str):
+    """Fetch the journal row for key, or None."""
+    rows = _execute("SELECT * FROM writes WHERE key = ?", (key,))
+    if not rows:
+        return None
+    row = dict(rows[0])
+    row["result"] = json.loads(row["result"]) if row["result"] else None
+    return row
+
+
+def _journal_forget(key: str):
+    """Drop the journal row for key so the next write starts afresh."""
+    _execute("DELETE FROM writes WHERE key = ?", (key,))
+    return None
+
+
+def _journal_begin(key: str, op: str, repo: str):
+    """Record that a write is about to be sent."""
+    started_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    _execute(
+        "INSERT INTO writes (key, op, repo, status, started_at) VALUES (?, ?, ?, 'pending', ?)"
+        " ON CONFLICT(key) DO UPDATE SET status = 'pending'",
+        (key, op, repo, started_at),
+    )
+
+
+def _journal_finish(key: str, obj):
+    """Record the created object so retries need no request at all."""
+    # The creating response is complete, so _rawData holds the full payload
+    _execute(
+        "UPDATE writes SET status = 'done', finished_at = ?, result = ? WHERE key = ?",
+        (time.time(), json.dumps(obj._rawData), key),
+    )
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Lightweight result records and a fast read path for large listings.
+
+PyGithub objects keep the whole JSON payload plus a requester, and reading
+an attribute the payload did not include silently issues a GET to
+"complete" the object. For listings with tens of thousands of entries,
+the functions here fetch the raw JSON pages directly (100 items per page)
+and keep only the fields the helpers use, in ``__slots__`` records.
+Attribute reads on a record never touch the network.
+
+Usage:
+    from models import list_issues_fast
+
+    for issue in list_issues_fast("owner/repo", state="all"):
+        print(issue.number, issue.title, issue.labels)
+"""
+
+import re
+from typing import List
+
+if __package__:
+    from .github_client import get_github_client
+    from .resilience import call
+else:
+    from github_client import get_github_client
+    from resilience import call
+
+PER_PAGE = 100
+
+_NEXT_LINK = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+class Record:
+    """Base for compact read-only records built from API JSON."""
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self):
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.__slots__[:2])
+        return f"{type(self).__name__}({fields})"
+
+    def as_dict(self) -> dict:
+        """Return the record as a plain dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class IssueRecord(Record):
+    __slots__ = (
+        "number", "title", "state", "body", "labels", "assignees", "user",
+        "comments", "created_at", "updated_at", "html_url", "is_pull_request",
+    )
+
+    @classmethod
+    def from_json(cls, data: dict):
+        return cls(
+            data["number"],
+            data["title"],
+            data["state"],
+            data.get("body") or "",
+            tuple(label["name"] for label in data.get("labels") or ()),
+            tuple(user["login"] for user in data.get("assignees") or ()),
+            (data.get("user") or {}).get("login"),
+            data.get("comments", 0),
+            data.get("created_at"),
+            data.get("updated_at"),
+            data.get("html_url"),
+            "pull_request" in data,
+        )
+
+
+class BranchRecord(Record):
+    __slots__ = ("name", "sha", "protected")
+
+    @classmethod
+    def from_json(cls, data: dict):
+        return cls(data["name"], data["commit"]["sha"], data.get("protected", False))
+
+
+class TreeEntry(Record):
+    __slots__ = ("path", "type", "mode", "sha", "size")
+
+    @classmethod
+    def from_json(cls, data: dict):
+        return cls(data["path"], data["type"], data["mode"], data["sha"], data.get("size"))
+
+
+class CodeResult(Record):
+    __slots__ = ("repository", "path", "name", "sha", "html_url")
+
+    @classmethod
+    def from_json(cls, data: dict):
+        return cls(
+            data["repository"]["full_name"],
+            data["path"],
+            data["name"],
+            data["sha"],
+            data.get("html_url"),
+        )
+
+
+def fetch_pages(path: str, params: dict = None, items_key: str = None, bucket: str = "core",
+                endpoint: str = "api.list", hedge: bool = False):
+    """
+    Yield items from every page of a list endpoint.
+
+    Each page request is retried (and optionally hedged) on its own, so a
+    failure on page 40 does not start the listing over.
+
+    Args:
+        path: API path (e.g., "/repos/owner/repo/issues")
+        params: Query parameters for the first page
+        items_key: Key holding the items when the page is an object
+                   (e.g., "items" for search results)
+        bucket: Rate-limit bucket of the endpoint (e.g., "code_search")
+        endpoint: Name for the retry/breaker policy (see resilience.call)
+        hedge: Hedge slow page requests
+
+    Yields:
+        Raw JSON items
+    """
+    owner = path.split("/")[2] if path.startswith("/repos/") else None
+    requester = get_github_client(bucket=bucket, owner=owner).requester
+    url = path
+    params = dict(params or {}, per_page=PER_PAGE)
+
+    while url:
+        headers, data = call(
+            lambda: requester.requestJsonAndCheck("GET", url, parameters=params),
+            endpoint, idempotent=True, hedge=hedge,
+        )
+        yield from (data[items_key] if items_key else data)
+        match = _NEXT_LINK.search(headers.get("link", ""))
+        url = match.group(1) if match else None
+        params = None  # the next link already carries the query string
+
+
+def list_issues_fast(
+    repo: str,
+    state: str = "open",
+    labels: list = None,
+    assignee: str = None,
+    since: str = None,
+) -> List[IssueRecord]:
+    """
+    List issues as IssueRecords (same filters as create_issue.list_issues).
+
+    Args:
+        repo: Repository in format "owner/repo"
+        state: "open", "closed", or "all"
+        labels: Filter by labels
+        assignee: Filter by assignee username
+        since: ISO 8601 date string
+
+    Returns:
+        List of IssueRecord
+    """
+    params = {"state": state}
+    if labels:
+        params["labels"] = ",".join(labels)
+    if assignee:
+        params["assignee"] = assignee
+    if since:
+        params["since"] = since
+
+    issues = [
+        IssueRecord.from_json(d)
+        for d in fetch_pages(f"/repos/{repo}/issues", params, endpoint="issues.list", hedge=True)
+    ]
+    print(f"Found {len(issues)} issues in {repo} ({state})")
+    return issues
+
+
+def list_branches_fast(repo_name: str) -> List[BranchRecord]:
+    """
+    List all branches as BranchRecords.
+
+    Args:
+        repo_name: Repository in format "owner/repo"
+
+    Returns:
+        List of BranchRecord
+    """
+    branches = [
+        BranchRecord.from_json(d)
+        for d in fetch_pages(f"/repos/{repo_name}/branches", endpoint="branches.list", hedge=True)
+    ]
+    print(f"Found {len(branches)} branches in {repo_name}")
+    return branches
+
+
+def get_repository_tree_fast(
+    repo_name: str,
+    tree_sha: str = "HEAD",
+    recursive: bool = True,
+    path_filter: str = None,
+) -> List[TreeEntry]:
+    """
+    Get the repository file tree as TreeEntry records.
+
+    Args:
+        repo_name: Repository in format "owner/repo"
+        tree_sha: Tree SHA or ref (defaults to HEAD of the default branch)
+        recursive: Get full tree recursively
+        path_filter: Optional path prefix filter
+
+    Returns:
+        List of TreeEntry
+    """
+    requester = get_github_client(owner=repo_name.split("/")[0]).requester
+    params = {"recursive": "1"} if recursive else None
+    _, data = call(
+        lambda: requester.requestJsonAndCheck(
+            "GET", f"/repos/{repo_name}/git/trees/{tree_sha}", parameters=params
+        ),
+        "git.trees.get", idempotent=True, hedge=True,
+    )
+
+    items = [
+        TreeEntry.from_json(d) for d in data["tree"]
+        if not path_filter or d["path"].startswith(path_filter)
+    ]
+    if data.get("truncated"):
+        print("⚠ Tree was truncated by GitHub; fetch subtrees for the full listing")
+    print(f"Retrieved tree with {len(items)} items")
+    return items
+
+
+def search_code_fast(query: str, repo: str = None) -> List[CodeResult]:
+    """
+    Search code, returning CodeResult records with the repository name inline.
+
+    Args:
+        query: Search query (supports GitHub code search syntax)
+        repo: Optional repo to limit search to "owner/repo"
+
+    Returns:
+        List of CodeResult
+    """
+    full_query = f"{query} repo:{repo}" if repo else query
+    results = [
+        CodeResult.from_json(d)
+        for d in fetch_pages(
+            "/search/code", {"q": full_query}, items_key="items", bucket="code_search",
+            endpoint="search.code",
+        )
+    ]
+    print(f"Found {len(results)} code results for: {full_query}")
+    return results
@@ -9,19 +9,23 @@ Usage:
     push_multiple_files(repo, files=[...], message="Initial commit")
 """
 
-from github import Github, GithubException, InputGitTreeElement
-import os
+from github import GithubException, InputGitTreeElement
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import base64
 from typing import List, Dict, Optional
 
-
-def get_github_client():
-    """Get authenticated GitHub client."""
-    token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
-    if not token:
-        raise ValueError("GITHUB_PERSONAL_ACCESS_TOKEN environment variable not set")
-    return Github(token)
+if __package__:
+    from .github_client import cached, get_github_client, get_repo, invalidate
+    from .models import search_code_fast
+    from .resilience import call, resilient
+else:
+    from github_client import cached, get_github_client, get_repo, invalidate
+    from models import search_code_fast
+    from resilience import call, resilient
 
 
+@resilient("repos.create")
 def create_repository(
     name: str,
     description: str = "",
@@ -46,7 +50,7 @@ def create_repository(
     Returns:
         Repository object
     """
-    g = get_github_client()
+    g = get_github_client(write=True, owner=organization)
 
     try:
         if organization:
@@ -80,6 +84,7 @@ def create_repository(
         raise
 
 
+@resilient("git.refs.create")
 def create_branch(repo_name: str, branch_name: str, from_branch: str = None):
     """
     Create a new branch in a repository.
@@ -92,8 +97,7 @@ def create_branch(repo_name: str, branch_name: str, from_branch: str = None):
     Returns:
         GitRef object for the new branch
     """
-    g = get_github_client()
-    repo = g.get_repo(repo_name)
+    repo = get_repo(repo_name, write=True)
 
     # Get source branch
     if from_branch:
@@ -106,11 +110,13 @@ def create_branch(repo_name: str, branch_name: str, from_branch: str = None):
         ref=f"refs/heads/{branch_name}",
         sha=source.commit.sha
     )
+    invalidate("branches", repo_name)
 
     print(f"✓ Created branch '{branch_name}' from '{source.name}'")
     return ref
 
 
+@resilient("git.push")
 def push_multiple_files(
     repo_name: str,
     files: List[Dict[str, str]],
@@ -130,8 +136,7 @@ def push_multiple_files(
     Returns:
         Commit object
     """
-    g = get_github_client()
-    repo = g.get_repo(repo_name)
+    repo = get_repo(repo_name, write=True)
 
     # Get branch reference
     if not branch:
@@ -164,6 +169,8 @@ def push_multiple_files(
 
     # Update branch reference
     ref.edit(sha=commit.sha)
+    invalidate("branches", repo_name)
+    invalidate("tree", repo_name)
 
     print(f"✓ Pushed {len(files)} files to {branch}")
     print(f"  Commit: {commit.sha[:7]} - {message}")
@@ -171,6 +178,97 @@ def push_multiple_files(
     return commit
 
 
+@resilient("git.push")
+def push_commits(
+    repo_name: str,
+    changesets: List[Dict],
+    branch: str = None,
+    max_workers: int = 8,
+):
+    """
+    Push a series of commits and move the branch once at the end.
+
+    Blobs for every changeset are uploaded concurrently (identical contents
+    only once). The commits are then chained, each tree built on the previous
+    one, and the branch ref is updated a single time. Before moving the ref,
+    it is re-read and compared with the SHA the chain was built on; the
+    update is also sent without force, so a concurrent push is never
+    overwritten.
+
+    Args:
+        repo_name: Repository in format "owner/repo"
+        changesets: List of dicts with 'message' and 'files' keys; each file is
+                    {"path": ..., "content": str | bytes | None, "mode": optional}.
+                    A content of None deletes the path.
+                    Example: [{"message": "Add app", "files": [{"path": "app.py", "content": "..."}]}]
+        branch: Branch name (defaults to repository default branch)
+        max_workers: Number of concurrent blob uploads
+
+    Returns:
+        List of Commit objects, oldest first
+    """
+    repo = get_repo(repo_name, write=True)
+
+    if not branch:
+        branch = repo.default_branch
+
+    ref = repo.get_git_ref(f"heads/{branch}")
+    original_sha = ref.object.sha
+    parent = repo.get_git_commit(original_sha)
+
+    # Upload each distinct blob once, in parallel
+    contents = list({
+        f["content"] for cs in changesets for f in cs["files"] if f["content"] is not None
+    })
+
+    def upload(content):
+        if isinstance(content, bytes):
+            return repo.create_git_blob(base64.b64encode(content).decode("ascii"), "base64").sha
+        return repo.create_git_blob(content, "utf-8").sha
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        blob_shas = dict(zip(contents, pool.map(upload, contents)))
+
+    # Chain the commits, each tree layered on the previous one
+    tree = parent.tree
+    commits = []
+    for changeset in changesets:
+        tree_elements = [
+            InputGitTreeElement(
+                path=file["path"],
+                mode=file.get("mode", "100644"),
+                type="blob",
+                sha=blob_shas[file["content"]] if file["content"] is not None else None,
+            )
+            for file in changeset["files"]
+        ]
+        tree = repo.create_git_tree(tree_elements, base_tree=tree)
+        parent = repo.create_git_commit(
+            message=changeset["message"],
+            tree=tree,
+            parents=[parent]
+        )
+        commits.append(parent)
+
+    # Compare-and-swap: only move the ref if nobody else did meanwhile
+    current_sha = repo.get_git_ref(f"heads/{branch}").object.sha
+    if current_sha != original_sha:
+        raise GithubException(409, {
+            "message": f"{branch} moved from {original_sha[:7]} to {current_sha[:7]} "
+                       f"while building commits"
+        })
+    ref.edit(sha=parent.sha, force=False)
+    invalidate("branches", repo_name)
+    invalidate("tree", repo_name)
+
+    print(f"✓ Pushed {len(commits)} commits to {branch}")
+    for commit, changeset in zip(commits, changesets):
+        print(f"  Commit: {commit.sha[:7]} - {changeset['message']}")
+
+    return commits
+
+
+@resilient("contents.delete")
 def delete_file(repo_name: str, path: str, message: str, branch: str = None):
     """
     Delete a file from the repository.
@@ -184,8 +282,7 @@ def delete_file(repo_name: str, path: str, message: str, branch: str = None):
     Returns:
         Commit info dict
     """
-    g = get_github_client()
-    repo = g.get_repo(repo_name)
+    repo = get_repo(repo_name, write=True)
 
     if not branch:
         branch = repo.default_branch
@@ -200,6 +297,8 @@ def delete_file(repo_name: str, path: str, message: str, branch: str = None):
         sha=contents.sha,
         branch=branch
     )
+    invalidate("branches", repo_name)
+    invalidate("tree", repo_name)
 
     print(f"✓ Deleted {path} from {branch}")
     return result
@@ -217,10 +316,12 @@ def get_file_contents(repo_name: str, path: str, ref: str = None):
     Returns:
         ContentFile or list of ContentFile objects
     """
-    g = get_github_client()
-    repo = g.get_repo(repo_name)
+    repo = get_repo(repo_name)
 
-    contents = repo.get_contents(path, ref=ref or repo.default_branch)
+    contents = call(
+        lambda: repo.get_contents(path, ref=ref or repo.default_branch),
+        "contents.get", idempotent=True, hedge=True,
+    )
 
     # If it's a single file, decode and return content
     if not isinstance(contents, list):
@@ -232,6 +333,7 @@ def get_file_contents(repo_name: str, path: str, ref: str = None):
     return contents
 
 
+@resilient("search.code", idempotent=True)
 def search_code(query: str, repo: str = None):
     """
     Search for code across repositories.
@@ -243,7 +345,7 @@ def search_code(query: str, repo: str = None):
     Returns:
         List of ContentFile objects
     """
-    g = get_github_client()
+    g = get_github_client(bucket="code_search")
 
     # Add repo filter if provided
     full_query = query
@@ -257,6 +359,7 @@ def search_code(query: str, repo: str = None):
     return list(results)
 
 
+@resilient("repos.fork", idempotent=True)
 def fork_repository(repo_name: str, organization: str = None):
     """
     Fork a repository.
@@ -268,8 +371,7 @@ def fork_repository(repo_name: str, organization: str = None):
     Returns:
         Repository object of the fork
     """
-    g = get_github_client()
-    repo = g.get_repo(repo_name)
+    repo = get_repo(repo_name, write=True)
 
     if organization:
         fork = repo.create_fork(organization=organization)
@@ -292,10 +394,14 @@ def list_branches(repo_name: str):
     Returns:
         List of Branch objects
     """
-    g = get_github_client()
-    repo = g.get_repo(repo_name)
-
-    branches = list(repo.get_branches())
+    repo = get_repo(repo_name)
+
+    # Not hedged: a duplicate would repeat every page (models.list_branches_fast
+    # hedges page by page)
+    branches = cached(("branches", repo_name), lambda: call(
+        lambda: list(repo.get_branches()),
+        "branches.list", idempotent=True,
+    ))
     print(f"Found {len(branches)} branches in {repo_name}")
 
     for branch in branches:
@@ -305,6 +411,182 @@ def list_branches(repo_name: str):
     return branches
 
 
+def create_branches(
+    repo_name: str,
+    branch_names: List[str],
+    from_branch: str = None,
+    max_workers: int = 8,
+):
+    """
+    Create many branches from one source commit.
+
+    The source SHA is resolved once; the refs are then created concurrently.
+
+    Args:
+        repo_name: Repository in format "owner/repo"
+        branch_names: Names of the new branches
+        from_branch: Source branch (defaults to repository default branch)
+        max_workers: Number of concurrent ref creations
+
+    Returns:
+        List of GitRef objects for the branches that were created
+    """
+    repo = get_repo(repo_name, write=True)
+    source = from_branch or repo.default_branch
+    sha = repo.get_git_ref(f"heads/{source}").object.sha
+
+    def create(name):
+        try:
+            return repo.create_git_ref(ref=f"refs/heads/{name}", sha=sha)
+        except GithubException as e:
+            print(f"✗ Could not create '{name}': {e.data.get('message', str(e))}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        refs = [ref for ref in pool.map(create, branch_names) if ref is not None]
+    invalidate("branches", repo_name)
+
+    print(f"✓ Created {len(refs)}/{len(branch_names)} branches from '{source}' ({sha[:7]})")
+    return refs
+
+
+def list_refs(repo_name: str, prefix: str = "heads/", write: bool = False):
+    """
+    List refs whose name starts with prefix, via the matching-refs endpoint.
+
+    Args:
+        repo_name: Repository in format "owner/repo"
+        prefix: Ref prefix without "refs/" (e.g., "heads/dependabot/", "tags/v1.")
+        write: Bind the refs to the write identity (for editing or deleting them)
+
+    Returns:
+        List of GitRef objects
+    """
+    repo = get_repo(repo_name, write=write)
+    refs = call(
+        lambda: list(repo.get_git_matching_refs(prefix)),
+        "git.refs.list", idempotent=True,
+    )
+    print(f"Found {len(refs)} refs matching '{prefix}' in {repo_name}")
+    return refs
+
+
+def cleanup_branches(
+    repo_name: str,
+    prefix: str = "",
+    base: str = None,
+    merged_only: bool = True,
+    older_than_days: int = None,
+    dry_run: bool = True,
+    batch_size: int = 50,
+    max_workers: int = 8,
+):
+    """
+    Delete merged and/or stale branches in bulk.
+
+    Branches are listed with one matching-refs call. Each branch is then
+    compared against base in batched GraphQL queries (batch_size comparisons
+    per request) instead of one compare call per branch. Deletions run
+    concurrently.
+
+    A branch counts as merged when it has no commits that base lacks; branches
+    merged by squash or rebase keep their own commits and only match on age.
+    At least one criterion is required: merged_only=False without
+    older_than_days raises ValueError instead of selecting every branch.
+
+    Args:
+        repo_name: Repository in format "owner/repo"
+        prefix: Only consider branches starting with this prefix (e.g., "bot/")
+        base: Branch to compare against (defaults to repository default branch)
+        merged_only: Only delete branches fully merged into base
+        older_than_days: Only delete branches whose last commit is older than this
+        dry_run: List the branches that would be deleted without deleting
+        batch_size: Branch comparisons per GraphQL request
+        max_workers: Number of concurrent comparison batches and deletions
+
+    Returns:
+        List of branch names deleted (or that would be deleted in a dry run)
+    """
+    if not merged_only and older_than_days is None:
+        raise ValueError(
+            "cleanup_branches needs merged_only=True or older_than_days; "
+            "otherwise every branch under the prefix would be deleted"
+        )
+
+    repo = get_repo(repo_name, write=True)
+    base = base or repo.default_branch
+    refs = [
+        ref for ref in list_refs(repo_name, f"heads/{prefix}", write=not dry_run)
+        if ref.ref[len("refs/heads/"):] not in (base, repo.default_branch)
+    ]
+
+    owner, name = repo_name.split("/")
+    batches = [refs[i:i + batch_size] for i in range(0, len(refs), batch_size)]
+
+    def compare(batch):
+        fields = "\n".join(
+            f"b{i}: ref(qualifiedName: $r{i}) {{ "
+            f"target {{ ... on Commit {{ committedDate }} }} "
+            f"compare(headRef: $base) {{ behindBy }} }}"
+            for i in range(len(batch))
+        )
+        params = "".join(f", $r{i}: String!" for i in range(len(batch)))
+        query = (
+            f"query($owner: String!, $name: String!, $base: String!{params}) {{ "
+            f"repository(owner: $owner, name: $name) {{ {fields} }} }}"
+        )
+        variables = {"owner": owner, "name": name, "base": base}
+        variables.update({f"r{i}": ref.ref for i, ref in enumerate(batch)})
+        _, data = call(
+            lambda: get_github_client(bucket="graphql", owner=owner).requester.graphql_query(
+                query, variables
+            ),
+            "graphql.compare", idempotent=True,
+        )
+        return [(ref, data["data"]["repository"][f"b{i}"]) for i, ref in enumerate(batch)]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        compared = [pair for result in pool.map(compare, batches) for pair in result]
+
+    cutoff = None
+    if older_than_days is not None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+
+    doomed = []
+    for ref, info in compared:
+        if info is None:
+            continue
+        if merged_only and (info["compare"] is None or info["compare"]["behindBy"] != 0):
+            continue
+        if cutoff:
+            committed = info["target"].get("committedDate")
+            if not committed or datetime.fromisoformat(committed.replace("Z", "+00:00")) >= cutoff:
+                continue
+        doomed.append(ref)
+
+    names = [ref.ref[len("refs/heads/"):] for ref in doomed]
+    if dry_run:
+        for branch in names:
+            print(f"  - {branch}")
+        print(f"Dry run: would delete {len(names)} of {len(refs)} branches in {repo_name}")
+        return names
+
+    def delete(ref):
+        try:
+            call(ref.delete, "git.refs.delete", idempotent=True)
+            return True
+        except GithubException as e:
+            print(f"✗ Could not delete {ref.ref}: {e.data.get('message', str(e))}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        deleted = [n for n, ok in zip(names, pool.map(delete, doomed)) if ok]
+    invalidate("branches", repo_name)
+
+    print(f"✓ Deleted {len(deleted)} of {len(refs)} branches in {repo_name}")
+    return deleted
+
+
 def get_repository_tree(
     repo_name: str,
     tree_sha: str = None,
@@ -323,15 +605,18 @@ def get_repository_tree(
     Returns:
         List of tree elements
     """
-    g = get_github_client()
-    repo = g.get_repo(repo_name)
+    repo = get_repo(repo_name)
 
     if not tree_sha:
         tree_sha = repo.default_branch
 
-    tree = repo.get_git_tree(tree_sha, recursive=recursive)
-
-    items = tree.tree
+    items = cached(
+        ("tree", repo_name, tree_sha, recursive),
+        lambda: call(
+            lambda: repo.get_git_tree(tree_sha, recursive=recursive).tree,
+            "git.trees.get", idempotent=True, hedge=True,
+        ),
+    )
     if path_filter:
         items = [item for item in items if item.path.startswith(path_filter)]
 
@@ -349,6 +634,7 @@ if __name__ == "__main__":
         print("  branch <repo> <branch-name> [from-branch]")
         print("  search <query>")
         print("  fork <repo> [--org ORG]")
+        print("  cleanup <repo> [prefix] [--days N] [--delete]")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -367,11 +653,18 @@ if __name__ == "__main__":
 
     elif command == "search":
         query = sys.argv[2]
-        results = search_code(query)
+        # Records carry the repository name, so printing needs no extra requests
+        results = search_code_fast(query)
         for r in results[:10]:  # Show first 10
-            print(f"  {r.repository.full_name}/{r.path}")
+            print(f"  {r.repository}/{r.path}")
 
     elif command == "fork":
         repo = sys.argv[2]
         org = sys.argv[sys.argv.index("--org") + 1] if "--org" in sys.argv else None
         fork_repository(repo, organization=org)
+
+    elif command == "cleanup":
+        repo = sys.argv[2]
+        prefix = sys.argv[3] if len(sys.argv) > 3 and not sys.argv[3].startswith("--") else ""
+        days = int(sys.argv[sys.argv.index("--days") + 1]) if "--days" in sys.argv else None
+        cleanup_branches(repo, prefix, older_than_days=days, dry_run="--delete" not in sys.argv)
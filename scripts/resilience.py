@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Retries, hedged reads and circuit breakers shared by the helper modules.
+
+Requests go through ``call(fn, endpoint, ...)``, or a whole helper is
+wrapped with ``@resilient(endpoint, ...)``:
+
+- transient failures (5xx, connection resets, timeouts) of idempotent calls
+  are retried with exponential backoff and full jitter
+- reads marked ``hedge=True`` send a duplicate request when the first one is
+  slower than the endpoint's p95 latency and use whichever answers first
+- each endpoint has a circuit breaker; after repeated transient failures
+  calls fail fast with CircuitOpenError until a cool-down has passed
+- every call's latency goes into a per-endpoint histogram, which provides
+  the hedge threshold and is reported by ``stats()``
+
+Non-idempotent writes (creating issues, PRs, comments) are never retried
+here, and ``transport_retry()`` configures PyGithub so they are not
+retried at the HTTP layer either.
+
+Calls nest: a ``call`` made while an enclosing call on the same thread is
+already retrying makes a single attempt and leaves the failure to the
+enclosing call's retry and breaker, so attempts never multiply. Hedging
+repeats the whole callable, so hedge the request itself rather than a
+helper that prints or writes, or a ``list()`` of a multi-page listing.
+
+Usage:
+    from resilience import call, resilient
+
+    readme = call(lambda: repo.get_readme(), "contents.readme",
+                  idempotent=True, hedge=True)
+
+    @resilient("issues.update", idempotent=True)
+    def update_issue(...):
+        ...
+"""
+
+import bisect
+import functools
+import os
+import random
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from github import GithubException
+from github.GithubRetry import GithubRetry
+
+MAX_ATTEMPTS = int(os.environ.get("GITHUB_RETRY_ATTEMPTS", "4"))
+BACKOFF_BASE = float(os.environ.get("GITHUB_RETRY_BACKOFF", "0.5"))
+BACKOFF_MAX = 30.0
+
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+# Histogram bucket upper bounds in seconds (log-spaced, 10ms .. ~80s)
+_BOUNDS = [0.01 * 1.5 ** i for i in range(23)]
+
+_lock = threading.Lock()
+_local = threading.local()
+_histograms = {}
+_breakers = {}
+_hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate quantiles."""
+
+    def __init__(self):
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Add one observation."""
+        with self._lock:
+            self.counts[bisect.bisect_left(_BOUNDS, seconds)] += 1
+            self.total += 1
+
+    def quantile(self, q: float):
+        """Upper bound of the bucket holding the q-quantile (None if empty)."""
+        with self._lock:
+            if not self.total:
+                return None
+            target = q * self.total
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= target:
+                    return _BOUNDS[min(index, len(_BOUNDS) - 1)]
+        return _BOUNDS[-1]
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial -> closed."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Check whether a call may go through (one trial call when half-open)."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+def transport_retry():
+    """
+    PyGithub retry policy used by the shared client.
+
+    Rate-limit 403s (which GitHub rejected without applying) are still
+    retried after their Retry-After wait, but read timeouts and 5xx
+    responses are not. Those are handled per call by ``resilient``,
+    where it is known whether the call is safe to repeat.
+    """
+    return GithubRetry(total=5, read=0, status_forcelist=[])
+
+
+def is_transient(error: Exception) -> bool:
+    """Check whether an error is worth retrying."""
+    if isinstance(error, GithubException):
+        return error.status is not None and error.status >= 500
+    return isinstance(error, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        ConnectionResetError,
+        socket.timeout,
+    ))
+
+
+def call(fn, endpoint: str, idempotent: bool = False, hedge: bool = False):
+    """
+    Run fn() with the retry, hedging and circuit breaker policy of endpoint.
+
+    Args:
+        fn: Zero-argument callable making the request(s)
+        endpoint: Name used for the breaker and histogram (e.g., "issues.list")
+        idempotent: Safe to repeat, so transient failures are retried
+        hedge: Send a duplicate when slower than the endpoint's p95 (reads only)
+
+    Returns:
+        Result of fn()
+    """
+    histogram, breaker = _state(endpoint)
+    # Inside a retrying call, that call retries and counts the failure
+    nested = getattr(_local, "retrying", False)
+    attempts = MAX_ATTEMPTS if idempotent and not nested else 1
+    run = _within(fn, nested or attempts > 1)
+
+    for attempt in range(attempts):
+        if not nested and not breaker.allow():
+            raise CircuitOpenError(
+                f"{endpoint} is failing; not calling it for up to {breaker.cooldown:.0f}s"
+            )
+
+        start = time.monotonic()
+        try:
+            threshold = histogram.quantile(HEDGE_QUANTILE) if hedge else None
+            if threshold is not None and histogram.total >= HEDGE_MIN_SAMPLES:
+                result = _hedged(run, threshold)
+            else:
+                result = run()
+        except Exception as e:
+            if nested:
+                raise
+            if not is_transient(e):
+                breaker.success()
+                raise
+            breaker.failure()
+            if attempt == attempts - 1:
+                raise
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+            print(f"⚠ {endpoint} failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        histogram.record(time.monotonic() - start)
+        if not nested:
+            breaker.success()
+        return result
+
+
+def resilient(endpoint: str, idempotent: bool = False, hedge: bool = False):
+    """
+    Decorator applying ``call`` to every invocation of a helper.
+
+    Only hedge helpers without side effects; a hedged helper may run twice.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return call(lambda: fn(*args, **kwargs), endpoint, idempotent, hedge)
+        return wrapper
+    return decorator
+
+
+def stats():
+    """
+    Report latency and breaker state per endpoint.
+
+    Returns:
+        Dict of endpoint to {"count", "p50", "p95", "breaker"}
+    """
+    with _lock:
+        endpoints = list(_histograms)
+    return {
+        endpoint: {
+            "count": _histograms[endpoint].total,
+            "p50": _histograms[endpoint].quantile(0.5),
+            "p95": _histograms[endpoint].quantile(0.95),
+            "breaker": _breakers[endpoint].state,
+        }
+        for endpoint in endpoints
+    }
+
+
+def _state(endpoint: str):
+    """Get (creating if needed) the histogram and breaker for an endpoint."""
+    with _lock:
+        if endpoint not in _histograms:
+            _histograms[endpoint] = LatencyHistogram()
+            _breakers[endpoint] = CircuitBreaker()
+        return _histograms[endpoint], _breakers[endpoint]
+
+
+def _within(fn, retrying: bool):
+    """Wrap fn so calls made inside it (on any thread) see whether it retries."""
+    def run():
+        previous = getattr(_local, "retrying", False)
+        _local.retrying = retrying
+        try:
+            return fn()
+        finally:
+            _local.retrying = previous
+    return run
+
+
+def _hedged(fn, delay: float):
+    """Run fn, starting a duplicate after delay seconds; first success wins."""
+    futures = {_hedge_pool.submit(fn)}
+    done, _ = wait(futures, timeout=delay)
+    if not done:
+        futures.add(_hedge_pool.submit(fn))
+
+    error = None
+    while futures:
+        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
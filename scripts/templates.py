@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Compiled, cached issue and PR body templates.
+
+Templates live in ``assets/`` and are discovered once:
+
+- ``<kind>_template.md`` is the ``default`` template of a kind
+  (``issue_template.md`` -> kind "issue", name "default")
+- ``<kind>_<name>_template.md`` adds a named template
+- sections of a template file that start with ``## For <Name> ...`` and are
+  separated by ``---`` become variants: ``issue_template.md`` yields "bug"
+  and "feature", each keeping the shared sections plus its own
+
+Placeholders are written ``{{ name }}``. Templates are compiled once and
+kept in memory; files are re-read only when their mtime changes (checked
+at most once per CHECK_INTERVAL seconds), so bulk runs render thousands of
+bodies without touching the disk.
+
+Usage:
+    from templates import render_template
+
+    body = render_template("issue", "bug", version="1.2.3")
+"""
+
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "assets"
+
+# Seconds between mtime checks of the templates directory.
+CHECK_INTERVAL = 1.0
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+_VARIANT_HEADING = re.compile(r"^## For (\w+)", re.MULTILINE)
+_SECTION_SEPARATOR = re.compile(r"^---[ \t]*$", re.MULTILINE)
+
+_lock = threading.Lock()
+_templates = {}
+_mtimes = {}
+_boilerplate = frozenset()
+_checked_at = 0.0
+
+
+class Template:
+    """A template split once into literal text and placeholder names."""
+
+    __slots__ = ("kind", "name", "placeholders", "_parts")
+
+    def __init__(self, kind: str, name: str, text: str):
+        self.kind = kind
+        self.name = name
+        # Even indexes hold literal text, odd indexes hold placeholder names
+        self._parts = _PLACEHOLDER.split(text)
+        self.placeholders = sorted(set(self._parts[1::2]))
+
+    def render(self, **variables) -> str:
+        """
+        Fill in placeholders.
+
+        Args:
+            **variables: Values for the template placeholders
+
+        Returns:
+            Rendered text
+        """
+        parts = list(self._parts)
+        try:
+            for i in range(1, len(parts), 2):
+                parts[i] = str(variables[parts[i]])
+        except KeyError as e:
+            raise KeyError(
+                f"Template {self.kind}/{self.name} needs variable {e.args[0]!r}"
+            ) from None
+        return "".join(parts)
+
+
+def get_template(kind: str, name: str = "default"):
+    """
+    Get a compiled template.
+
+    Args:
+        kind: Template kind ("issue" or "pr")
+        name: Template name (e.g., "default", "bug", "feature")
+
+    Returns:
+        Template object, or None if the kind has no templates at all
+    """
+    templates = _current()
+    if (kind, name) in templates:
+        return templates[(kind, name)]
+
+    available = sorted(n for k, n in templates if k == kind)
+    if not available:
+        return None
+    raise ValueError(f"Unknown {kind} template {name!r}; available: {', '.join(available)}")
+
+
+def render_template(kind: str, name: str = "default", **variables) -> str:
+    """
+    Render a template, or return "" if the kind has no templates.
+
+    Args:
+        kind: Template kind ("issue" or "pr")
+        name: Template name (e.g., "default", "bug", "feature")
+        **variables: Values for the template placeholders
+
+    Returns:
+        Rendered text
+    """
+    template = get_template(kind, name)
+    return template.render(**variables) if template else ""
+
+
+def render_many(kind: str, name: str, rows: List[Dict]) -> List[str]:
+    """
+    Render one template for many sets of variables.
+
+    Args:
+        kind: Template kind ("issue" or "pr")
+        name: Template name
+        rows: One dict of variables per body
+
+    Returns:
+        List of rendered bodies
+    """
+    template = get_template(kind, name)
+    if template is None:
+        return ["" for _ in rows]
+    return [template.render(**row) for row in rows]
+
+
+def list_templates(kind: str = None) -> List[str]:
+    """List available templates as "kind/name" strings."""
+    return sorted(f"{k}/{n}" for k, n in _current() if kind in (None, k))
+
+
+def boilerplate_lines() -> frozenset:
+    """
+    Lines of literal template text (headings, prompts, checkboxes).
+
+    Used to ignore text that every templated body shares, e.g. when
+    comparing issues for similarity.
+
+    Returns:
+        Set of stripped, non-empty lines
+    """
+    _current()
+    return _boilerplate
+
+
+def _current():
+    """Return the compiled templates, reloading them if files changed."""
+    global _templates, _mtimes, _boilerplate, _checked_at
+    now = time.monotonic()
+    if now - _checked_at < CHECK_INTERVAL and _templates:
+        return _templates
+
+    with _lock:
+        mtimes = _scan_mtimes()
+        if mtimes != _mtimes:
+            # Build aside and swap in, so readers never see a half-filled dict
+            templates = {}
+            for path in sorted(TEMPLATES_DIR.glob("*_template.md")):
+                templates.update(_compile_file(path))
+            _boilerplate = frozenset(
+                line.strip()
+                for template in templates.values()
+                for literal in template._parts[::2]
+                for line in literal.splitlines()
+                if line.strip()
+            )
+            _templates = templates
+            _mtimes = mtimes
+        _checked_at = now
+        return _templates
+
+
+def _scan_mtimes():
+    """Map template paths to their mtimes (directory included for new files)."""
+    if not TEMPLATES_DIR.is_dir():
+        return {}
+    mtimes = {TEMPLATES_DIR: TEMPLATES_DIR.stat().st_mtime_ns}
+    for path in TEMPLATES_DIR.glob("*_template.md"):
+        mtimes[path] = path.stat().st_mtime_ns
+    return mtimes
+
+
+def _compile_file(path: Path):
+    """Compile a template file and its section variants."""
+    stem = path.name[: -len("_template.md")]
+    kind, _, name = stem.partition("_")
+    name = name or "default"
+    text = path.read_text()
+
+    compiled = {(kind, name): Template(kind, name, text)}
+    if name != "default":
+        return compiled
+
+    sections = _SECTION_SEPARATOR.split(text)
+    variants = {}
+    for index, section in enumerate(sections):
+        match = _VARIANT_HEADING.search(section)
+        if match:
+            variants[match.group(1).lower()] = index
+
+    for variant, keep in variants.items():
+        chosen = [
+            section for index, section in enumerate(sections)
+            if index == keep or index not in variants.values()
+        ]
+        compiled[(kind, variant)] = Template(kind, variant, "---".join(chosen))
+    return compiled
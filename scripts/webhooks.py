@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Webhook receiver that keeps the local response caches fresh.
+
+Instead of polling ``list_issues``, ``list_branches`` and
+``get_repository_tree``, point a repository (or organization) webhook at this
+receiver. Deliveries are verified against ``GITHUB_WEBHOOK_SECRET`` and
+applied incrementally to the caches in ``github_client``:
+
+- ``issues`` / ``pull_request``: upsert or remove the issue in every cached
+  issue listing whose filters it matches
+- ``push``: move the branch to the pushed SHA and drop trees cached by ref name
+- ``create`` / ``delete``: add or remove branches
+- ``repository``: drop the cached Repository handle (default branch etc.)
+
+Trees cached by commit SHA never go stale and are left alone. While the
+receiver runs, cached listings live for ``GITHUB_WEBHOOK_CACHE_TTL`` seconds
+(default 3600) as a safety net against missed deliveries.
+
+Usage:
+    python webhooks.py serve [port] [--record DIR]
+    python webhooks.py replay recorded/*.json
+
+    from webhooks import apply_event
+
+    apply_event("issues", payload)
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+
+from github.Branch import Branch
+from github.Issue import Issue
+
+if __package__:
+    from . import github_client
+    from .github_client import (
+        cache_drop, cache_entries, cache_update, get_github_client, invalidate,
+    )
+else:
+    import github_client
+    from github_client import (
+        cache_drop, cache_entries, cache_update, get_github_client, invalidate,
+    )
+
+WEBHOOK_SECRET = os.environ.get("GITHUB_WEBHOOK_SECRET")
+WEBHOOK_CACHE_TTL = float(os.environ.get("GITHUB_WEBHOOK_CACHE_TTL", "3600"))
+
+# Fields shared by the issue and pull request payloads
+_PR_ISSUE_FIELDS = (
+    "id", "node_id", "url", "html_url", "number", "state", "locked", "title",
+    "body", "user", "labels", "assignee", "assignees", "milestone", "comments",
+    "created_at", "updated_at", "closed_at", "author_association",
+)
+
+
+def verify_signature(body: bytes, signature: str, secret: str = None) -> bool:
+    """
+    Check the X-Hub-Signature-256 header of a delivery.
+
+    Args:
+        body: Raw request body
+        signature: Header value ("sha256=<hex>")
+        secret: Webhook secret (defaults to GITHUB_WEBHOOK_SECRET)
+
+    Returns:
+        True if the signature matches
+    """
+    secret = secret or WEBHOOK_SECRET
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def apply_event(event: str, payload: dict) -> str:
+    """
+    Apply one webhook event to the local caches.
+
+    Args:
+        event: Event name from the X-GitHub-Event header
+        payload: Parsed delivery body
+
+    Returns:
+        Short description of what was applied
+    """
+    repo = payload.get("repository", {}).get("full_name")
+    if not repo:
+        return f"ignored {event} (no repository)"
+
+    if event == "issues":
+        issue = payload["issue"]
+        if payload.get("action") in ("deleted", "transferred"):
+            _remove_issue(repo, issue["number"])
+        else:
+            _upsert_issue(repo, issue)
+        return f"{event}.{payload.get('action')} {repo}#{issue['number']}"
+
+    if event == "pull_request":
+        pr = payload["pull_request"]
+        _upsert_issue(repo, _issue_from_pull(pr))
+        return f"{event}.{payload.get('action')} {repo}#{pr['number']}"
+
+    if event == "push":
+        ref = payload["ref"]
+        _drop_trees(repo, ref)
+        if ref.startswith("refs/heads/"):
+            name = ref[len("refs/heads/"):]
+            if payload.get("deleted"):
+                _remove_branch(repo, name)
+            else:
+                _upsert_branch(repo, name, payload["after"])
+        return f"push {repo} {ref} -> {payload.get('after', '')[:7]}"
+
+    if event in ("create", "delete"):
+        ref = payload["ref"]
+        _drop_trees(repo, ref)
+        if payload.get("ref_type") == "branch":
+            if event == "delete":
+                _remove_branch(repo, ref)
+            elif not _branch_cached(repo, ref):
+                # The create event carries no SHA; the matching push event
+                # usually fills it in, otherwise reload on next read
+                invalidate("branches", repo)
+        return f"{event} {payload.get('ref_type')} {repo} {ref}"
+
+    if event == "repository":
+        # Renames, default branch changes, archiving: refetch the handle
+        invalidate("repo", repo)
+        if payload.get("action") in ("deleted", "renamed", "transferred"):
+            invalidate(None, repo)
+        return f"repository.{payload.get('action')} {repo}"
+
+    return f"ignored {event}"
+
+
+def _issue_matches(issue: dict, state, labels, assignee, since) -> bool:
+    """Check an issue payload against the filters of a cached listing."""
+    if state != "all" and issue["state"] != state:
+        return False
+    names = {label["name"] for label in issue.get("labels") or []}
+    if any(label not in names for label in labels):
+        return False
+    logins = {user["login"] for user in issue.get("assignees") or []}
+    if assignee == "none" and logins:
+        return False
+    if assignee == "*" and not logins:
+        return False
+    if assignee not in (None, "none", "*") and assignee not in logins:
+        return False
+    if hasattr(since, "isoformat"):
+        since = since.isoformat()
+    if since and issue["updated_at"] < since:
+        return False
+    return True
+
+
+def _upsert_issue(repo: str, raw: dict):
+    """Insert, replace or drop an issue in every cached issue listing."""
+    g = get_github_client()
+
+    def update(key, issues):
+        state, labels, assignee, since = key[2:]
+        kept = [i for i in issues if i.number != raw["number"]]
+        if _issue_matches(raw, state, labels, assignee, since):
+            issue = g.create_from_raw_data(Issue, raw)
+            if len(kept) == len(issues):
+                kept.insert(0, issue)
+            else:
+                index = next(n for n, i in enumerate(issues) if i.number == raw["number"])
+                kept.insert(index, issue)
+        return kept
+
+    cache_update("issues", repo, update)
+
+
+def _remove_issue(repo: str, number: int):
+    """Drop an issue from every cached issue listing."""
+    cache_update("issues", repo, lambda key, issues: [i for i in issues if i.number != number])
+
+
+def _issue_from_pull(pr: dict) -> dict:
+    """Build the issues-API representation of a pull request payload."""
+    raw = {field: pr.get(field) for field in _PR_ISSUE_FIELDS}
+    raw["pull_request"] = {
+        "url": pr.get("url"),
+        "html_url": pr.get("html_url"),
+        "diff_url": pr.get("diff_url"),
+        "patch_url": pr.get("patch_url"),
+        "merged_at": pr.get("merged_at"),
+    }
+    return raw
+
+
+def _branch_cached(repo: str, name: str) -> bool:
+    """Check whether any cached branch listing already contains name."""
+    return any(
+        b.name == name for _, branches in cache_entries("branches", repo) for b in branches
+    )
+
+
+def _upsert_branch(repo: str, name: str, sha: str):
+    """Point a branch at sha in every cached branch listing."""
+    g = get_github_client()
+    # Push payloads carry the HTML URL of the repository, so build the API URL
+    commit_url = f"{g.requester.base_url}/repos/{repo}/commits/{sha}"
+
+    def update(key, branches):
+        existing = next((b for b in branches if b.name == name), None)
+        raw = {
+            "name": name,
+            "commit": {"sha": sha, "url": commit_url},
+            "protected": existing.protected if existing else False,
+        }
+        kept = [b for b in branches if b.name != name]
+        kept.append(g.create_from_raw_data(Branch, raw))
+        kept.sort(key=lambda b: b.name)
+        return kept
+
+    cache_update("branches", repo, update)
+
+
+def _remove_branch(repo: str, name: str):
+    """Drop a branch from every cached branch listing."""
+    cache_update("branches", repo, lambda key, branches: [b for b in branches if b.name != name])
+
+
+def _drop_trees(repo: str, ref: str):
+    """Forget trees that were cached by the (now moved) ref name."""
+    short = ref.split("/", 2)[-1] if ref.startswith("refs/") else ref
+    names = {ref, short, f"heads/{short}", f"tags/{short}"}
+    for key, _ in cache_entries("tree", repo):
+        if key[2] in names:
+            cache_drop(key)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Accept webhook deliveries, verify them and update the caches."""
+
+    secret = None
+    record_dir = None
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not verify_signature(body, self.headers.get("X-Hub-Signature-256"), self.secret):
+            self.send_response(401)
+            self.end_headers()
+            return
+
+        event = self.headers.get("X-GitHub-Event", "")
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        if self.record_dir:
+            _record(self.record_dir, dict(self.headers), body)
+        try:
+            print(f"✓ {apply_event(event, payload)}")
+        except (KeyError, TypeError, AttributeError) as e:
+            print(f"⚠ Malformed {event} payload ({e!r})")
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        self.send_response(202)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_receiver(port: int = 8787, host: str = "127.0.0.1", secret: str = None,
+                   record_dir: str = None):
+    """
+    Start the webhook receiver on a background thread.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind (put a tunnel or reverse proxy in front)
+        secret: Webhook secret (defaults to GITHUB_WEBHOOK_SECRET)
+        record_dir: Optional directory to save deliveries for later replay
+
+    Returns:
+        The running ThreadingHTTPServer
+    """
+    secret = secret or WEBHOOK_SECRET
+    if not secret:
+        raise ValueError("GITHUB_WEBHOOK_SECRET environment variable not set")
+
+    handler = type("Handler", (_Handler,), {"secret": secret, "record_dir": record_dir})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Deliveries keep the caches fresh, so listings can live much longer
+    github_client.CACHE_TTL = max(github_client.CACHE_TTL, WEBHOOK_CACHE_TTL)
+
+    print(f"✓ Receiving webhooks on http://{host}:{port}/")
+    return server
+
+
+def replay(paths: List[str], secret: str = None) -> int:
+    """
+    Apply recorded deliveries to the local caches.
+
+    Each file holds {"headers": {...}, "body": "<raw JSON body>"} as written
+    by ``start_receiver(record_dir=...)``. Signatures are checked when the
+    recording has one and a secret is available.
+
+    Args:
+        paths: Recorded delivery files, applied in the given order
+        secret: Webhook secret (defaults to GITHUB_WEBHOOK_SECRET)
+
+    Returns:
+        Number of deliveries applied
+    """
+    secret = secret or WEBHOOK_SECRET
+    applied = 0
+    for path in paths:
+        recording = json.loads(Path(path).read_text())
+        headers = {k.lower(): v for k, v in recording["headers"].items()}
+        body = recording["body"].encode("utf-8")
+
+        signature = headers.get("x-hub-signature-256")
+        if secret and signature and not verify_signature(body, signature, secret):
+            print(f"✗ Bad signature, skipped {path}")
+            continue
+
+        print(f"✓ {apply_event(headers.get('x-github-event', ''), json.loads(body))}")
+        applied += 1
+    return applied
+
+
+def _record(record_dir: str, headers: dict, body: bytes):
+    """Save one delivery so it can be replayed later."""
+    directory = Path(record_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    delivery = headers.get("X-GitHub-Delivery") or str(time.time_ns())
+    path = directory / f"{time.strftime('%Y%m%dT%H%M%S')}-{delivery}.json"
+    path.write_text(json.dumps({"headers": headers, "body": body.decode("utf-8")}))
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("serve", "replay"):
+        print("Usage:")
+        print("  python webhooks.py serve [port] [--record DIR]")
+        print("  python webhooks.py replay <recording.json>...")
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command == "serve":
+        record = sys.argv[sys.argv.index("--record") + 1] if "--record" in sys.argv else None
+        port = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 8787
+        start_receiver(port, record_dir=record)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+    elif command == "replay":
+        count = replay(sys.argv[2:])
+        print(f"\nReplayed {count} deliveries")
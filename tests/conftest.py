@@ -0,0 +1,27 @@
+"""Offline test setup: a dummy token, a private cache dir and no webhook secret."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Set before the helpers are imported; they read these at import time
+os.environ["GITHUB_PERSONAL_ACCESS_TOKEN"] = "test-token"
+os.environ["GITHUB_DEV_TOOLS_CACHE"] = tempfile.mkdtemp(prefix="github-dev-tools-")
+os.environ.pop("GITHUB_TOKENS", None)
+os.environ.pop("GITHUB_APP_ID", None)
+os.environ.pop("GITHUB_WEBHOOK_SECRET", None)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+from scripts.github_client import clear_caches  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Start every test with empty client and response caches."""
+    clear_caches()
+    yield
+    clear_caches()
@@ -0,0 +1,65 @@
+import pytest
+
+from scripts.dedupe import DuplicateIndex
+from scripts.models import IssueRecord
+
+
+def _record(number, title, body, state="open"):
+    return IssueRecord.from_json({
+        "number": number, "title": title, "body": body, "state": state,
+        "html_url": f"https://github.com/octo/app/issues/{number}",
+    })
+
+
+@pytest.fixture
+def index():
+    index = DuplicateIndex("octo/app")
+    index.add(_record(
+        1, "Login fails on Safari",
+        "Clicking the login button does nothing on Safari 17. No request is sent.",
+    ))
+    index.add(_record(
+        2, "Add dark mode to the settings page",
+        "Users want a dark theme toggle next to the language selector.",
+    ))
+    index.add(_record(
+        3, "Export to CSV crashes with unicode names",
+        "Exporting a report with accented customer names raises UnicodeEncodeError.",
+        state="closed",
+    ))
+    return index
+
+
+def test_query_finds_near_duplicate(index):
+    matches = index.query(
+        "Login button fails in Safari",
+        "Clicking login does nothing on Safari 17, no request is sent.",
+    )
+
+    assert [m["number"] for m in matches] == [1]
+    assert matches[0]["similarity"] >= 0.5
+
+
+def test_query_ignores_unrelated_issue(index):
+    assert index.query(
+        "Pagination skips the last page",
+        "The issue list never shows items from the final page of results.",
+    ) == []
+
+
+def test_closed_issues_only_match_when_asked(index):
+    title = "CSV export crashes on unicode names"
+    body = "Exporting a report with accented customer names raises UnicodeEncodeError."
+
+    assert index.query(title, body) == []
+    assert [m["number"] for m in index.query(title, body, state="all")] == [3]
+
+
+def test_add_replaces_earlier_version(index):
+    index.add(_record(1, "Login fails on Safari", "Fixed upstream.", state="closed"))
+
+    assert index.issues[1]["state"] == "closed"
+    assert index.query(
+        "Login button fails in Safari",
+        "Clicking login does nothing on Safari 17, no request is sent.",
+    ) == []
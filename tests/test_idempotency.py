@@ -0,0 +1,145 @@
+from datetime import datetime
+
+import pytest
+from github import GithubException
+from github.GitRef import GitRef
+from github.Issue import Issue
+
+from scripts import idempotency
+from scripts.github_client import get_github_client
+
+REPO = "octo/app"
+
+
+@pytest.fixture(autouse=True)
+def journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(idempotency, "JOURNAL_PATH", tmp_path / "writes.db")
+
+
+def _issue(number, body="", created_at="2026-01-01T00:00:00Z"):
+    return get_github_client().create_from_raw_data(Issue, {
+        "number": number, "title": f"Issue {number}", "state": "open",
+        "body": body, "created_at": created_at,
+    })
+
+
+def _ref(name):
+    return get_github_client().create_from_raw_data(GitRef, {
+        "ref": f"refs/heads/{name}", "object": {"sha": "a" * 40, "type": "commit"},
+    })
+
+
+class Calls:
+    """Fake reconcile/create that count their calls."""
+
+    def __init__(self, found=None, created=None, error=None):
+        self.found = found
+        self.created = created
+        self.error = error
+        self.reconciles = 0
+        self.creates = 0
+
+    def reconcile(self, started_at):
+        self.reconciles += 1
+        return self.found
+
+    def create(self):
+        self.creates += 1
+        if self.error:
+            raise self.error
+        return self.created
+
+
+def _run(calls, key="k", klass=Issue, verify=False):
+    return idempotency._run_once(
+        key, "issue", REPO, klass, calls.reconcile, calls.create, verify=verify
+    )
+
+
+def test_done_row_is_returned_without_request():
+    _run(Calls(created=_issue(7)))
+
+    calls = Calls()
+    result = _run(calls)
+
+    assert result.number == 7
+    assert (calls.reconciles, calls.creates) == (0, 0)
+
+
+def test_done_row_expires_after_ttl(monkeypatch):
+    _run(Calls(created=_issue(7)))
+    monkeypatch.setattr(idempotency, "JOURNAL_TTL", -1)
+
+    calls = Calls(created=_issue(8))
+    assert _run(calls).number == 8
+    assert (calls.reconciles, calls.creates) == (0, 1)
+    assert idempotency._journal_get("k")["status"] == "done"
+
+
+def test_pending_row_is_reconciled_by_marker(monkeypatch):
+    key = "feedface" * 8
+    idempotency._journal_begin(key, "issue", REPO)
+    started = datetime.fromisoformat(idempotency._journal_get(key)["started_at"])
+    marker = idempotency.MARKER.format(key=key)
+    listing = [
+        _issue(12, "unrelated", created_at="2099-01-01T00:00:00Z"),
+        _issue(11, f"body\n\n{marker}", created_at="2099-01-01T00:00:00Z"),
+    ]
+    seen = {}
+
+    class Repo:
+        def get_issues(self, **kwargs):
+            seen.update(kwargs)
+            return listing
+
+    monkeypatch.setattr(idempotency, "get_repo", lambda repo, write=False: Repo())
+    monkeypatch.setattr(idempotency, "create_issue", lambda *a, **k: pytest.fail("created twice"))
+
+    issue = idempotency.create_issue_once(REPO, "Bug", body="body", key=key)
+
+    assert issue.number == 11
+    # The server filters by its own clock, so since= allows for skew too
+    assert seen["since"] == started - idempotency.CLOCK_SKEW
+    assert idempotency._journal_get(key)["status"] == "done"
+
+
+def test_pending_row_without_match_creates():
+    idempotency._journal_begin("k", "issue", REPO)
+
+    calls = Calls(created=_issue(9))
+    assert _run(calls).number == 9
+    assert (calls.reconciles, calls.creates) == (1, 1)
+
+
+def test_422_is_reconciled():
+    error = GithubException(422, {"message": "Reference already exists"}, None)
+    calls = Calls(found=_ref("feature"), error=error)
+
+    result = _run(calls, klass=GitRef)
+
+    assert result.ref == "refs/heads/feature"
+    assert idempotency._journal_get("k")["status"] == "done"
+
+
+def test_422_without_match_raises():
+    error = GithubException(422, {"message": "Validation Failed"}, None)
+
+    with pytest.raises(GithubException):
+        _run(Calls(error=error))
+    assert idempotency._journal_get("k")["status"] == "pending"
+
+
+def test_done_branch_is_verified():
+    _run(Calls(created=_ref("feature")), klass=GitRef, verify=True)
+
+    calls = Calls(found=_ref("feature"))
+    assert _run(calls, klass=GitRef, verify=True).ref == "refs/heads/feature"
+    assert (calls.reconciles, calls.creates) == (1, 0)
+
+
+def test_deleted_branch_is_created_again():
+    _run(Calls(created=_ref("feature")), klass=GitRef, verify=True)
+
+    calls = Calls(found=None, created=_ref("feature"))
+    _run(calls, klass=GitRef, verify=True)
+    assert (calls.reconciles, calls.creates) == (1, 1)
@@ -0,0 +1,165 @@
+import threading
+import time
+
+import pytest
+from github import GithubException
+
+from scripts import resilience
+from scripts.resilience import CircuitBreaker, CircuitOpenError, call
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(resilience, "_histograms", {})
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "BACKOFF_BASE", 0.0)
+
+
+class Flaky:
+    """Callable failing with the given error a number of times, then returning "ok"."""
+
+    def __init__(self, failures=float("inf"), error=None):
+        self.failures = failures
+        self.error = error or GithubException(502, {"message": "Bad Gateway"}, None)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+def test_idempotent_call_retries_transient_errors():
+    fn = Flaky(failures=2)
+
+    assert call(fn, "test.get", idempotent=True) == "ok"
+    assert fn.calls == 3
+
+
+def test_retries_stop_after_max_attempts():
+    fn = Flaky()
+
+    with pytest.raises(GithubException):
+        call(fn, "test.get", idempotent=True)
+    assert fn.calls == resilience.MAX_ATTEMPTS
+
+
+def test_writes_and_client_errors_are_not_retried():
+    write = Flaky()
+    with pytest.raises(GithubException):
+        call(write, "test.create")
+    assert write.calls == 1
+
+    missing = Flaky(error=GithubException(404, {"message": "Not Found"}, None))
+    with pytest.raises(GithubException):
+        call(missing, "test.get", idempotent=True)
+    assert missing.calls == 1
+
+
+def test_nested_call_makes_a_single_attempt():
+    inner = Flaky()
+
+    with pytest.raises(GithubException):
+        call(lambda: call(inner, "test.inner", idempotent=True), "test.outer", idempotent=True)
+
+    assert inner.calls == resilience.MAX_ATTEMPTS
+    # Only the retrying call counts the failures
+    assert resilience._breakers["test.outer"].failures == resilience.MAX_ATTEMPTS
+    assert resilience._breakers["test.inner"].failures == 0
+
+
+def test_nested_call_under_a_write_still_retries():
+    inner = Flaky(failures=1)
+
+    assert call(lambda: call(inner, "test.inner", idempotent=True), "test.create") == "ok"
+    assert inner.calls == 2
+
+
+def test_breaker_opens_then_allows_one_trial():
+    breaker = CircuitBreaker(threshold=2, cooldown=30)
+    assert breaker.state == "closed"
+
+    breaker.failure()
+    breaker.failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    breaker.opened_at -= 30
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+
+    breaker.success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_breaker():
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.failure()
+    breaker.opened_at -= 30
+
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.state == "open"
+
+
+def test_open_breaker_fails_fast():
+    fn = Flaky()
+    for _ in range(resilience.BREAKER_THRESHOLD):
+        with pytest.raises(GithubException):
+            call(fn, "test.get")
+
+    with pytest.raises(CircuitOpenError):
+        call(fn, "test.get")
+    assert fn.calls == resilience.BREAKER_THRESHOLD
+
+
+def _warm(endpoint, seconds=0.01):
+    histogram, _ = resilience._state(endpoint)
+    for _ in range(resilience.HEDGE_MIN_SAMPLES):
+        histogram.record(seconds)
+
+
+def test_hedge_first_success_wins():
+    _warm("test.hedged")
+    calls = []
+    lock = threading.Lock()
+
+    def read():
+        with lock:
+            calls.append(time.monotonic())
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    assert call(read, "test.hedged", idempotent=True, hedge=True) == "fast"
+    assert len(calls) == 2
+
+
+def test_hedge_survives_failed_first_request():
+    _warm("test.hedged")
+    calls = []
+    lock = threading.Lock()
+
+    def read():
+        with lock:
+            calls.append(None)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.2)
+            raise GithubException(404, {"message": "Not Found"}, None)
+        return "second"
+
+    assert call(read, "test.hedged", hedge=True) == "second"
+
+
+def test_fast_request_is_not_hedged():
+    _warm("test.hedged", seconds=1.0)
+    fn = Flaky(failures=0)
+
+    assert call(fn, "test.hedged", idempotent=True, hedge=True) == "ok"
+    assert fn.calls == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from scripts import templates
+from scripts.templates import get_template, render_template
+
+
+@pytest.fixture
+def template_dir(tmp_path, monkeypatch):
+    # Teardown restores the whole cache, so later tests see the bundled templates
+    monkeypatch.setattr(templates, "TEMPLATES_DIR", tmp_path)
+    monkeypatch.setattr(templates, "_templates", {})
+    monkeypatch.setattr(templates, "_mtimes", {})
+    monkeypatch.setattr(templates, "_boilerplate", frozenset())
+    monkeypatch.setattr(templates, "_checked_at", 0.0)
+    return tmp_path
+
+
+def test_bug_variant_keeps_shared_sections_only():
+    body = render_template("issue", "bug")
+
+    assert "## Description" in body
+    assert "### Steps to Reproduce" in body
+    assert "## Additional Information" in body
+    assert "### Problem Statement" not in body
+
+
+def test_feature_variant_keeps_shared_sections_only():
+    body = render_template("issue", "feature")
+
+    assert "## Description" in body
+    assert "### Problem Statement" in body
+    assert "## Additional Information" in body
+    assert "### Steps to Reproduce" not in body
+
+
+def test_default_template_has_every_section():
+    body = render_template("issue")
+
+    assert "### Steps to Reproduce" in body
+    assert "### Problem Statement" in body
+
+
+def test_placeholders_and_missing_variables(template_dir):
+    (template_dir / "issue_upgrade_template.md").write_text(
+        "Upgrade {{ service }} to {{version}}.\n"
+    )
+
+    template = get_template("issue", "upgrade")
+    assert template.placeholders == ["service", "version"]
+    assert template.render(service="api", version="2.0") == "Upgrade api to 2.0.\n"
+    with pytest.raises(KeyError, match="version"):
+        template.render(service="api")
+
+
+def test_unknown_template_lists_available(template_dir):
+    (template_dir / "issue_template.md").write_text("## For Bugs\n")
+
+    with pytest.raises(ValueError, match="available: bugs, default"):
+        get_template("issue", "nope")
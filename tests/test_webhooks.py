@@ -0,0 +1,74 @@
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+import pytest
+from github.Branch import Branch
+from github.Issue import Issue
+
+from scripts.github_client import cache_put, cached, get_github_client
+from scripts.webhooks import apply_event, replay
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "webhooks").glob("*.json"))
+REPO = "octo/app"
+
+OPEN_KEY = ("issues", REPO, "open", (), None, None)
+ALL_KEY = ("issues", REPO, "all", (), None, None)
+BRANCHES_KEY = ("branches", REPO)
+
+
+def _issue(number, state):
+    return get_github_client().create_from_raw_data(Issue, {
+        "number": number, "title": f"Issue {number}", "state": state,
+        "labels": [], "assignees": [], "updated_at": "2026-01-01T00:00:00Z",
+    })
+
+
+def _branch(name, sha):
+    return get_github_client().create_from_raw_data(Branch, {
+        "name": name, "commit": {"sha": sha}, "protected": False,
+    })
+
+
+def _listing(key):
+    return cached(key, lambda: pytest.fail(f"{key} was dropped from the cache"))
+
+
+@pytest.fixture
+def listings():
+    cache_put(OPEN_KEY, [_issue(2, "open"), _issue(1, "open")])
+    cache_put(ALL_KEY, [_issue(2, "open"), _issue(1, "open")])
+    cache_put(BRANCHES_KEY, [_branch("main", "1" * 40), _branch("old", "2" * 40)])
+
+
+def test_replay_updates_cached_listings(listings):
+    assert replay([str(path) for path in FIXTURES]) == len(FIXTURES)
+
+    assert [i.number for i in _listing(OPEN_KEY)] == [3, 2]
+    assert [(i.number, i.state) for i in _listing(ALL_KEY)] == [
+        (3, "open"), (2, "open"), (1, "closed"),
+    ]
+    assert [(b.name, b.commit.sha) for b in _listing(BRANCHES_KEY)] == [
+        ("feature", "a" * 40), ("main", "1" * 40),
+    ]
+    # Lazy reads of the synthesized commit must go to the API, not github.com
+    assert _listing(BRANCHES_KEY)[0].commit.url == (
+        f"https://api.github.com/repos/{REPO}/commits/{'a' * 40}"
+    )
+
+
+def test_replay_skips_bad_signature(listings, tmp_path):
+    recording = json.loads(FIXTURES[0].read_text())
+    signature = hmac.new(b"other", recording["body"].encode(), hashlib.sha256).hexdigest()
+    recording["headers"]["X-Hub-Signature-256"] = f"sha256={signature}"
+    path = tmp_path / "forged.json"
+    path.write_text(json.dumps(recording))
+
+    assert replay([str(path)], secret="secret") == 0
+    assert [i.number for i in _listing(OPEN_KEY)] == [2, 1]
+
+
+def test_malformed_payload_raises_key_error(listings):
+    with pytest.raises(KeyError):
+        apply_event("issues", {"action": "opened", "repository": {"full_name": REPO}})